@@ -0,0 +1,144 @@
+import bisect
+import time
+
+# Head pose states that count as "distracted" when joined against application intervals
+DEFAULT_DISTRACTION_STATES = ("Looking at Phone",)
+INDEX_BLOCK_SIZE = 64
+
+
+class IntervalIndex:
+    """
+    Index of closed (label, start, end) intervals kept sorted by start time.
+
+    Intervals are grouped into fixed-size blocks that remember their largest end time,
+    so an overlap query only walks blocks that can contain a hit. The walk starts at the
+    first interval that could still reach the query (no interval is longer than the longest
+    one added), so querying recent time costs the same however long the history is.
+    Inserting intervals in start order (the normal streaming case) is an append.
+    """
+
+    def __init__(self, block_size=INDEX_BLOCK_SIZE):
+        self.block_size = block_size
+        self.starts = []
+        self.ends = []
+        self.labels = []
+        self.block_max_ends = []
+        self.max_duration = 0.0
+
+    def __len__(self):
+        return len(self.starts)
+
+    def add(self, label, start, end):
+        if end <= start:
+            return
+        if not self.starts or start >= self.starts[-1]:
+            pos = len(self.starts)
+        else:
+            pos = bisect.bisect_right(self.starts, start)
+        self.starts.insert(pos, start)
+        self.ends.insert(pos, end)
+        self.labels.insert(pos, label)
+        self.max_duration = max(self.max_duration, end - start)
+        self._refresh_block_max_ends(pos // self.block_size)
+
+    def _refresh_block_max_ends(self, first_block):
+        # An insert shifts every later entry by one slot, so recompute from the touched block onwards
+        num_blocks = (len(self.starts) + self.block_size - 1) // self.block_size
+        del self.block_max_ends[first_block:]
+        for block in range(first_block, num_blocks):
+            block_start = block * self.block_size
+            self.block_max_ends.append(max(self.ends[block_start:block_start + self.block_size]))
+
+    def overlapping(self, query_start, query_end):
+        """Yields (label, start, end) for every interval that overlaps [query_start, query_end)."""
+        # Only intervals starting before query_end can overlap
+        limit = bisect.bisect_left(self.starts, query_end)
+        # Intervals starting before this end before query_start
+        first = bisect.bisect_left(self.starts, query_start - self.max_duration)
+        for block in range(first // self.block_size, len(self.block_max_ends)):
+            block_start = block * self.block_size
+            if block_start >= limit:
+                break
+            if self.block_max_ends[block] <= query_start:
+                continue
+            for i in range(max(block_start, first), min(block_start + self.block_size, limit)):
+                if self.ends[i] > query_start:
+                    yield self.labels[i], self.starts[i], self.ends[i]
+
+
+class ActivityCorrelator:
+    """
+    Streaming join between HeadPoseMonitor state intervals and DistractionDetector app intervals.
+
+    Each finished distraction-state interval is joined once against the app index when it
+    is ingested, so the cost grows with the number of intervals rather than frames.
+    """
+
+    def __init__(self, distraction_states=DEFAULT_DISTRACTION_STATES):
+        self.distraction_states = set(distraction_states)
+        self.app_index = IntervalIndex()
+        self.pose_index = IntervalIndex()
+        self.open_app_sessions = {}  # app_title: session_start_time
+        self.distraction_time_by_app = {}  # Totals over finished distraction intervals
+
+    def ingest_app_intervals(self, app_intervals):
+        for app_title, start_time, end_time in app_intervals:
+            self.app_index.add(app_title, start_time, end_time)
+
+    def set_open_app_sessions(self, open_app_sessions):
+        self.open_app_sessions = dict(open_app_sessions)
+
+    def ingest_state_intervals(self, state_intervals):
+        """Adds finished pose intervals and accumulates their overlap with app intervals."""
+        for status, start_time, end_time in state_intervals:
+            if status not in self.distraction_states:
+                continue
+            self.pose_index.add(status, start_time, end_time)
+            self._accumulate_overlaps(self.distraction_time_by_app, start_time, end_time, end_time)
+
+    def _accumulate_overlaps(self, totals, start_time, end_time, now):
+        for app_title, app_start, app_end in self.app_index.overlapping(start_time, end_time):
+            overlap = min(end_time, app_end) - max(start_time, app_start)
+            if overlap > 0:
+                totals[app_title] = totals.get(app_title, 0.0) + overlap
+        # Sessions still open are treated as lasting until now
+        for app_title, app_start in self.open_app_sessions.items():
+            overlap = min(end_time, now) - max(start_time, app_start)
+            if overlap > 0:
+                totals[app_title] = totals.get(app_title, 0.0) + overlap
+
+    def get_live_distraction_by_app(self, current_state_interval=None, current_time=None):
+        """
+        Returns {app_title: seconds} over the whole session, including the
+        in-progress (status, start_time) state interval if one is given.
+        """
+        totals = dict(self.distraction_time_by_app)
+        if current_state_interval is not None:
+            status, start_time = current_state_interval
+            if status in self.distraction_states:
+                now = current_time if current_time is not None else time.time()
+                self._accumulate_overlaps(totals, start_time, now, now)
+        return totals
+
+    def get_distraction_by_app(self, range_start, range_end):
+        """
+        Returns {app_title: seconds} of distraction-state time within [range_start, range_end).
+        Intervals are only kept in memory, so ranges before the current session return nothing.
+        """
+        totals = {}
+        for _, start_time, end_time in self.pose_index.overlapping(range_start, range_end):
+            self._accumulate_overlaps(totals, max(start_time, range_start), min(end_time, range_end), range_end)
+        return totals
+
+    def get_formatted_distraction_for_display(self, totals, max_title_len=30):
+        """Returns display strings for a {app_title: seconds} mapping, longest first."""
+        if not totals:
+            return ["No distraction time recorded."]
+
+        display_strings = []
+        for app_title, duration_seconds in sorted(totals.items(), key=lambda item: item[1], reverse=True):
+            hours, remainder = divmod(duration_seconds, 3600)
+            minutes, seconds = divmod(remainder, 60)
+            display_title = app_title[:max_title_len] + "..." if len(app_title) > max_title_len else app_title
+            display_strings.append(f"{display_title} - {int(hours)}h{int(minutes)}m{int(seconds)}s")
+        return display_strings
@@ -0,0 +1,151 @@
+import os
+import psutil
+
+from put_it_down_detector.config_service import ConfigService
+from put_it_down_detector.detector import OVERLAY_FULL, OVERLAY_CONTOURS, OVERLAY_NONE
+
+GOVERNOR_CONFIG_FILE = "governor_config.json"
+DEFAULT_CPU_BUDGET_PERCENT = 15.0 # Share of total machine CPU (all cores) the app may use
+DEFAULT_TIMING_TOLERANCE_SECONDS = 0.25 # Max error per state transition in the head pose time totals
+GOVERNOR_SAMPLE_INTERVAL_SECONDS = 2.0
+CPU_SMOOTHING_FACTOR = 0.5 # Weight of the newest sample in the smoothed CPU reading
+STEP_UP_HEADROOM = 0.6 # Only raise quality when smoothed CPU is below this fraction of the budget...
+STEP_UP_SAMPLES = 3    # ...for this many consecutive samples
+LOOP_SMOOTHING_FACTOR = 0.1 # Weight of the newest frame in the smoothed head pose loop timings
+
+# Settings ladder, from best quality (level 0) to cheapest
+GOVERNOR_LEVELS = [
+    {"inference_fps": 30, "processing_scale": 1.0, "overlay_level": OVERLAY_FULL,
+     "label_refresh_seconds": 0.1, "pie_refresh_seconds": 0.5, "app_poll_seconds": 2.0},
+    {"inference_fps": 20, "processing_scale": 1.0, "overlay_level": OVERLAY_CONTOURS,
+     "label_refresh_seconds": 0.25, "pie_refresh_seconds": 1.0, "app_poll_seconds": 3.0},
+    {"inference_fps": 15, "processing_scale": 0.75, "overlay_level": OVERLAY_CONTOURS,
+     "label_refresh_seconds": 0.5, "pie_refresh_seconds": 2.0, "app_poll_seconds": 4.0},
+    {"inference_fps": 10, "processing_scale": 0.5, "overlay_level": OVERLAY_NONE,
+     "label_refresh_seconds": 0.5, "pie_refresh_seconds": 3.0, "app_poll_seconds": 5.0},
+    {"inference_fps": 5, "processing_scale": 0.5, "overlay_level": OVERLAY_NONE,
+     "label_refresh_seconds": 1.0, "pie_refresh_seconds": 5.0, "app_poll_seconds": 8.0},
+]
+
+
+class CpuGovernor:
+    """
+    Keeps the process's own CPU use under a budget by stepping through GOVERNOR_LEVELS.
+
+    State changes are only noticed on the next processed frame, so each transition in the
+    head pose time totals can be off by up to one frame interval. Levels whose frame interval
+    exceeds timing_tolerance_seconds are never used, which bounds that error. A level's frame
+    interval is the longer of its nominal 1/fps and the measured per-frame processing time
+    reported through record_loop_timing(), since a slow machine cannot reach the nominal rate.
+    """
+
+    def __init__(self):
+        self.process = psutil.Process(os.getpid())
+        self.cpu_count = psutil.cpu_count() or 1
+        self.process.cpu_percent(None) # First call only primes the counter
+
+        self.config_service = ConfigService(
+            GOVERNOR_CONFIG_FILE,
+            default={
+                "cpu_budget_percent": DEFAULT_CPU_BUDGET_PERCENT,
+                "timing_tolerance_seconds": DEFAULT_TIMING_TOLERANCE_SECONDS
+            },
+            validate=self._validate_config,
+            name="Governor config"
+        )
+        config = self.config_service.get()
+        self.cpu_budget_percent = config["cpu_budget_percent"]
+        self.timing_tolerance_seconds = config["timing_tolerance_seconds"]
+        self.config_service.add_listener(self._apply_config)
+
+        self.level = 0
+        self.smoothed_cpu_percent = None
+        self.last_cpu_percent = 0.0
+        self.samples_below_headroom = 0
+        self.measured_loop_interval = None # Smoothed seconds between processed frames
+        self.measured_processing_time = None # Smoothed seconds of work per frame, excluding the pacing sleep
+
+    def _validate_config(self, config):
+        if not isinstance(config, dict):
+            raise TypeError("governor config is not a JSON object")
+        return {
+            "cpu_budget_percent": float(config.get("cpu_budget_percent", DEFAULT_CPU_BUDGET_PERCENT)),
+            "timing_tolerance_seconds": float(config.get("timing_tolerance_seconds", DEFAULT_TIMING_TOLERANCE_SECONDS))
+        }
+
+    def _apply_config(self, config):
+        self.cpu_budget_percent = config["cpu_budget_percent"]
+        self.timing_tolerance_seconds = config["timing_tolerance_seconds"]
+        self.level = min(self.level, self.max_allowed_level())
+
+    def update_cpu_budget(self, val):
+        self.cpu_budget_percent = float(val)
+        self.config_service.update(cpu_budget_percent=self.cpu_budget_percent)
+
+    def record_loop_timing(self, loop_interval, processing_time):
+        """Called for each of the primary camera's frames with the time since its previous frame and the time spent on this one."""
+        if self.measured_loop_interval is None:
+            self.measured_loop_interval = loop_interval
+            self.measured_processing_time = processing_time
+        else:
+            self.measured_loop_interval += LOOP_SMOOTHING_FACTOR * (loop_interval - self.measured_loop_interval)
+            self.measured_processing_time += LOOP_SMOOTHING_FACTOR * (processing_time - self.measured_processing_time)
+
+    def max_allowed_level(self):
+        """Cheapest level whose frame interval still keeps state timing within the tolerance."""
+        # Processing time is measured at the current level; cheaper levels do no more work per frame,
+        # so using it for every level can only overestimate their interval
+        processing_time = self.measured_processing_time or 0.0
+        allowed = None
+        for level, settings in enumerate(GOVERNOR_LEVELS):
+            if max(1.0 / settings["inference_fps"], processing_time) <= self.timing_tolerance_seconds:
+                allowed = level
+        if allowed is None:
+            # Even the best level is too slow; hold the current level rather than stepping either way
+            return self.level
+        return allowed
+
+    def get_settings(self):
+        return dict(GOVERNOR_LEVELS[self.level])
+
+    def update(self):
+        """
+        Samples CPU use since the previous call and moves one level up or down if needed.
+        Call every GOVERNOR_SAMPLE_INTERVAL_SECONDS. Returns the settings to apply.
+        """
+        # cpu_percent() is relative to one core; normalise to a share of the whole machine
+        self.last_cpu_percent = self.process.cpu_percent(None) / self.cpu_count
+        if self.smoothed_cpu_percent is None:
+            self.smoothed_cpu_percent = self.last_cpu_percent
+        else:
+            self.smoothed_cpu_percent += CPU_SMOOTHING_FACTOR * (self.last_cpu_percent - self.smoothed_cpu_percent)
+
+        max_level = self.max_allowed_level()
+        if self.smoothed_cpu_percent > self.cpu_budget_percent and self.level < max_level:
+            self.level += 1
+            self.samples_below_headroom = 0
+            print(f"Governor: CPU {self.smoothed_cpu_percent:.1f}% over budget {self.cpu_budget_percent:.0f}%, stepping down to level {self.level}")
+        elif self.smoothed_cpu_percent < self.cpu_budget_percent * STEP_UP_HEADROOM and self.level > 0:
+            self.samples_below_headroom += 1
+            if self.samples_below_headroom >= STEP_UP_SAMPLES:
+                self.level -= 1
+                self.samples_below_headroom = 0
+                print(f"Governor: CPU {self.smoothed_cpu_percent:.1f}% well under budget, stepping up to level {self.level}")
+        else:
+            self.samples_below_headroom = 0
+        self.level = min(self.level, max_level)
+        return self.get_settings()
+
+    def get_status_text(self):
+        settings = self.get_settings()
+        cpu_text = f"{self.smoothed_cpu_percent:.1f}%" if self.smoothed_cpu_percent is not None else "N/A"
+        interval_text = f"{self.measured_loop_interval:.2f}s" if self.measured_loop_interval is not None else "N/A"
+        return (
+            f"CPU {cpu_text} / budget {self.cpu_budget_percent:.0f}% (level {self.level})\n"
+            f"{settings['inference_fps']} fps, {int(settings['processing_scale'] * 100)}% res, overlay {settings['overlay_level']}\n"
+            f"frame interval {interval_text} (tolerance {self.timing_tolerance_seconds:.2f}s)\n"
+            f"labels {settings['label_refresh_seconds']}s, pie {settings['pie_refresh_seconds']}s, apps {settings['app_poll_seconds']}s"
+        )
+
+    def flush_config(self):
+        self.config_service.flush()
@@ -1,46 +1,58 @@
 import psutil
 import time
-import pygetwindow as gw
-import os
-import json
+import collections
+import threading
+from put_it_down_detector.config_service import ConfigService
 
 BLOCK_CONFIG_FILE = "block_config.json" 
+FOCUS_SAMPLE_INTERVAL_SECONDS = 0.15 # ~7 Hz foreground-window sampling
+MAX_PENDING_FOCUS_INTERVALS = 1000 # Finished focus intervals kept until drained by pop_focus_state(); older ones are dropped
 
 class DistractionDetector:
-    def __init__(self):
+    def __init__(self, window_provider=None):
+        # Anything with pygetwindow's getAllWindows()/getActiveWindowTitle() API; benchmarks pass a fake one.
+        # pygetwindow is imported here rather than at module level because it fails to import on Linux.
+        if window_provider is None:
+            import pygetwindow as window_provider
+        self.window_provider = window_provider
         # app_title: {'initial_start_time': float, 'total_open_time': float, 'last_seen_time': float, 'is_currently_open': bool}
         self.open_apps = {} 
+        # Focus tracking: only the foreground window is queried, see update_focus().
+        # update_focus() runs on its own thread; _focus_lock guards the four focus fields below.
+        self._focus_lock = threading.Lock()
+        self.focus_times = {} # app_title: total seconds the window was in the foreground
+        self.focused_app = None
+        self.focus_start_time = None
+        self.completed_focus_intervals = collections.deque(maxlen=MAX_PENDING_FOCUS_INTERVALS) # Bounded: run() never drains it
         self.block_list = []
         self._load_block_list() # Use a "private" method for internal loading
 
+    def _validate_block_list(self, loaded_list):
+        if not (isinstance(loaded_list, list) and all(isinstance(item, str) for item in loaded_list)):
+            raise TypeError(f"{BLOCK_CONFIG_FILE} content is not a list of strings")
+        return loaded_list
+
     def _load_block_list(self):
-        try:
-            if os.path.exists(BLOCK_CONFIG_FILE):
-                with open(BLOCK_CONFIG_FILE, 'r') as f:
-                    loaded_list = json.load(f)
-                    if isinstance(loaded_list, list) and all(isinstance(item, str) for item in loaded_list):
-                        self.block_list = loaded_list
-                    else:
-                        print(f"Warning: {BLOCK_CONFIG_FILE} content is not a list of strings. Using empty block list.")
-                        self.block_list = []
-                        self._save_block_list() # Save empty list if format was wrong
-            else:
-                self.block_list = []
-                self._save_block_list() # Create file if it doesn't exist
-        except json.JSONDecodeError:
-            print(f"Error decoding {BLOCK_CONFIG_FILE}. Using empty block list and overwriting.")
-            self.block_list = []
-            self._save_block_list()
-        except Exception as e:
-            print(f"Error loading {BLOCK_CONFIG_FILE}: {e}. Using empty block list.")
-            self.block_list = []
+        self.block_config_service = ConfigService(
+            BLOCK_CONFIG_FILE, default=[], validate=self._validate_block_list, name="Block list"
+        )
+        self.block_config_service.add_listener(self._apply_block_list)
+        self.block_list = self.block_config_service.get()
+
+    def _apply_block_list(self, block_list):
+        self.block_list = block_list
 
     def _save_block_list(self):
-        try:
-            with open(BLOCK_CONFIG_FILE, 'w') as f:
-                json.dump(self.block_list, f, indent=4)
-        except Exception as e:
-            print(f"Error saving {BLOCK_CONFIG_FILE}: {e}")
+        """Hands the block list to the config service, which persists it debounced (one write for a batch of changes)."""
+        self.block_config_service.set(self.block_list)
+
+    def check_block_list_for_external_changes(self):
+        """Reloads block_config.json if it was edited outside the app. Returns True if a new list was applied."""
+        return self.block_config_service.check_for_external_changes()
+
+    def flush_config(self):
+        """Writes any pending block list changes to disk immediately."""
+        self.block_config_service.flush()
 
     def add_to_block_list(self, app_title):
         """Adds an app_title to the block list and saves. Removes from active tracking."""
@@ -49,6 +61,8 @@ class DistractionDetector:
             self._save_block_list()
             if app_title in self.open_apps:
                 del self.open_apps[app_title] # Remove from currently tracked apps
+                with self._focus_lock:
+                    self.focus_times.pop(app_title, None)
                 print(f"'{app_title}' added to block list and removed from active tracking.")
             else:
                 print(f"'{app_title}' added to block list.")
@@ -70,6 +84,65 @@ class DistractionDetector:
         """Returns a copy of the current block list."""
         return list(self.block_list)
 
+    def pop_focus_state(self):
+        """
+        Returns (completed, current) in one atomic step: the (app_title, start_time, end_time) focus
+        intervals finished since the last call, and {app_title: focus_start_time} for the focused app
+        ({} if none). Taking both together means an interval that ends in between is never lost.
+        Blocked titles are left out of both.
+        """
+        with self._focus_lock:
+            completed = list(self.completed_focus_intervals)
+            self.completed_focus_intervals.clear()
+            focused_app, focus_start_time = self.focused_app, self.focus_start_time
+        completed = [interval for interval in completed if interval[0] not in self.block_list]
+        current = {}
+        if focused_app is not None and focused_app not in self.block_list:
+            current[focused_app] = focus_start_time
+        return completed, current
+
+    def get_focus_time(self, app_title, current_time):
+        """Returns the total foreground time of app_title, including the in-progress focus interval."""
+        with self._focus_lock:
+            focus_seconds = self.focus_times.get(app_title, 0.0)
+            if app_title == self.focused_app and self.focus_start_time is not None:
+                focus_seconds += (current_time - self.focus_start_time)
+        return focus_seconds
+
+    def get_active_window_title(self):
+        """
+        Gets the title of the foreground window only. This is a single handle lookup,
+        much cheaper than enumerating every window with getAllWindows().
+        """
+        try:
+            if hasattr(self.window_provider, 'getActiveWindowTitle'):
+                return self.window_provider.getActiveWindowTitle() or None
+            window = self.window_provider.getActiveWindow()
+            return window.title if window and window.title else None
+        except Exception as e:
+            print(f"Error getting active window title: {e}")
+            return None
+
+    def update_focus(self):
+        """
+        Samples the foreground window and updates focus intervals.
+        Meant to be called at a high rate (5-10 Hz). Blocked apps are never counted as focused.
+        """
+        current_time = time.time()
+        title = self.get_active_window_title()
+        if title in self.block_list:
+            title = None
+        with self._focus_lock:
+            if title == self.focused_app:
+                return
+
+            if self.focused_app is not None and self.focused_app not in self.block_list:
+                duration = current_time - self.focus_start_time
+                self.focus_times[self.focused_app] = self.focus_times.get(self.focused_app, 0.0) + duration
+                self.completed_focus_intervals.append((self.focused_app, self.focus_start_time, current_time))
+            self.focused_app = title
+            self.focus_start_time = current_time if title is not None else None
+
     def get_all_open_window_titles(self):
         """
         Gets the titles of all currently open (and visible) windows.
@@ -77,7 +150,7 @@ class DistractionDetector:
         """
         titles = []
         try:
-            for window in gw.getAllWindows():
+            for window in self.window_provider.getAllWindows():
                 # Filter out windows with no title or very short titles if necessary
                 if window.title: 
                     titles.append(window.title)
@@ -158,8 +231,9 @@ class DistractionDetector:
             
             hours, remainder = divmod(duration_seconds, 3600)
             minutes, seconds = divmod(remainder, 60)
+            focus_minutes, focus_seconds = divmod(self.get_focus_time(app_title, current_time), 60)
             status = "Open" if data['is_currently_open'] else "Closed"
-            print(f"App: '{app_title}', Duration: {int(hours)}h {int(minutes)}m {int(seconds)}s ({status})")
+            print(f"App: '{app_title}', Duration: {int(hours)}h {int(minutes)}m {int(seconds)}s, Focused: {int(focus_minutes)}m {int(focus_seconds)}s ({status})")
         print("----------------------------------")
 
     def get_formatted_app_durations_for_display(self, current_display_time, max_title_len=30):
@@ -184,12 +258,17 @@ class DistractionDetector:
             
             hours, remainder = divmod(duration_seconds, 3600)
             minutes, seconds = divmod(remainder, 60)
+            focus_hours, focus_remainder = divmod(self.get_focus_time(app_title, current_display_time), 3600)
+            focus_minutes, focus_seconds = divmod(focus_remainder, 60)
             status_char = "O" if data['is_currently_open'] else "C"
             
             display_title = app_title[:max_title_len] + "..." if len(app_title) > max_title_len else app_title
             
-            # Format: App Title - 0h0m0s (Status)
-            display_strings.append(f"{display_title} - {int(hours)}h{int(minutes)}m{int(seconds)}s ({status_char})")
+            # Format: App Title - 0h0m0s open / 0h0m0s focus (Status)
+            display_strings.append(
+                f"{display_title} - {int(hours)}h{int(minutes)}m{int(seconds)}s open"
+                f" / {int(focus_hours)}h{int(focus_minutes)}m{int(focus_seconds)}s focus ({status_char})"
+            )
         return display_strings
 
     def run(self, check_interval=5):
@@ -206,7 +285,11 @@ class DistractionDetector:
             while True:
                 self.update_open_apps()
                 self.display_app_durations()
-                time.sleep(check_interval)
+                # Sample the foreground window between the (more expensive) full window scans
+                next_check_time = time.time() + check_interval
+                while time.time() < next_check_time:
+                    self.update_focus()
+                    time.sleep(FOCUS_SAMPLE_INTERVAL_SECONDS)
         except KeyboardInterrupt:
             print("\nDistraction Detector stopped.")
             self.display_app_durations() # Final display
@@ -0,0 +1,162 @@
+"""Benchmarks for DistractionDetector (with a fake window provider) and HeadPoseMonitor state tracking."""
+import math
+import os
+import time
+from types import SimpleNamespace
+
+from benchmarks.run_benchmarks import measure, result
+
+WINDOW_COUNTS = [10, 100, 1000, 10000]
+QUICK_WINDOW_COUNTS = [10, 100, 1000]
+FOCUS_WINDOW_COUNT = 1000 # update_focus only queries the active window; one size shared by quick and full runs
+FOCUS_SWITCH_EVERY = [1, 10] # Calls per foreground change: every sample a switch, or one in ten (the rest are "same title")
+HIDDEN_FRACTION = 0.05 # Share of windows "closed" on each poll, rotating, so apps keep closing and reopening
+BLOCKED_FRACTION = 0.01
+FRAME_RATE = 30.0
+NUM_LANDMARKS = 478 # FaceMesh with refine_landmarks=True
+SCRATCH_CONFIG_FILE = "hpm_config.json"
+
+
+class FakeWindowProvider:
+    """
+    Stands in for pygetwindow: num_windows titled windows, a rotating slice of which is hidden on each
+    getAllWindows() poll, and an active window that changes every focus_switch_every getActiveWindowTitle() calls.
+    The two methods keep separate counters so focus sampling never shifts which windows the open-apps poll hides.
+    """
+
+    def __init__(self, num_windows, focus_switch_every=10):
+        self.windows = [SimpleNamespace(title=f"Window {i} - Fake Application") for i in range(num_windows)]
+        self.hidden_count = max(1, int(num_windows * HIDDEN_FRACTION))
+        self.focus_switch_every = focus_switch_every
+        self.poll_count = 0
+        self.focus_poll_count = 0
+
+    def getAllWindows(self):
+        self.poll_count += 1
+        offset = (self.poll_count * self.hidden_count) % len(self.windows)
+        return self.windows[:offset] + self.windows[offset + self.hidden_count:]
+
+    def getActiveWindowTitle(self):
+        self.focus_poll_count += 1
+        return self.windows[(self.focus_poll_count // self.focus_switch_every) % len(self.windows)].title
+
+
+def _make_detector(num_windows, focus_switch_every=10):
+    from DistractionDetector import DistractionDetector
+    provider = FakeWindowProvider(num_windows, focus_switch_every)
+    detector = DistractionDetector(window_provider=provider)
+    detector.block_list = [] # Ignore block lists saved by earlier cases in the scratch directory
+    for window in provider.windows[:int(num_windows * BLOCKED_FRACTION)]:
+        detector.add_to_block_list(window.title)
+    detector.flush_config() # Write now rather than on a debounce timer in the middle of a measurement
+    detector.update_open_apps()
+    return detector
+
+
+def bench_update_open_apps(window_counts):
+    results = []
+    for num_windows in window_counts:
+        detector = _make_detector(num_windows)
+        stats = measure(detector.update_open_apps, repeat=3)
+        results.append(result("distraction_detector.update_open_apps", {"windows": num_windows}, stats))
+    return results
+
+
+def bench_formatted_durations(window_counts):
+    results = []
+    for num_windows in window_counts:
+        detector = _make_detector(num_windows)
+        stats = measure(lambda: detector.get_formatted_app_durations_for_display(time.time()), repeat=3)
+        results.append(result("distraction_detector.get_formatted_app_durations_for_display",
+                              {"windows": num_windows}, stats))
+    return results
+
+
+def bench_update_focus():
+    # Compare with update_open_apps at the same window count: focus sampling must stay far cheaper
+    results = []
+    for focus_switch_every in FOCUS_SWITCH_EVERY:
+        detector = _make_detector(FOCUS_WINDOW_COUNT, focus_switch_every)
+        stats = measure(detector.update_focus)
+        results.append(result("distraction_detector.update_focus",
+                              {"windows": FOCUS_WINDOW_COUNT, "focus_switch_every": focus_switch_every}, stats))
+    return results
+
+
+def make_synthetic_face(pitch_metric, nose_x, nose_y=0.5):
+    """A FaceMesh-like landmark list whose chin/forehead depth difference gives pitch_metric."""
+    landmarks = []
+    for i in range(NUM_LANDMARKS):
+        angle = 2.0 * math.pi * i / NUM_LANDMARKS
+        landmarks.append(SimpleNamespace(x=nose_x + 0.1 * math.cos(angle), y=nose_y + 0.12 * math.sin(angle), z=0.0))
+    from put_it_down_detector.detector import NOSE_TIP_INDEX, CHIN_INDEX, FOREHEAD_INDEX
+    landmarks[NOSE_TIP_INDEX] = SimpleNamespace(x=nose_x, y=nose_y, z=-0.05)
+    landmarks[FOREHEAD_INDEX] = SimpleNamespace(x=nose_x, y=nose_y - 0.12, z=0.0)
+    landmarks[CHIN_INDEX] = SimpleNamespace(x=nose_x, y=nose_y + 0.12, z=pitch_metric / 1000.0)
+    return SimpleNamespace(landmark=landmarks)
+
+
+def make_synthetic_stream(num_faces, seconds=20.0):
+    """
+    One entry per frame at FRAME_RATE: a list of faces cycling through screen, limbo, phone,
+    looking up and no-face phases, with per-face phase offsets and a little pitch noise.
+    """
+    phases = [(3.0, 10.0), (1.0, 150.0), (4.0, 160.0), (1.0, -120.0), (1.0, None)] # (seconds, pitch or no face)
+    cycle_seconds = sum(duration for duration, _ in phases)
+    stream = []
+    for frame_index in range(int(seconds * FRAME_RATE)):
+        t = frame_index / FRAME_RATE
+        faces = []
+        for face_index in range(num_faces):
+            phase_time = (t + face_index * 2.5) % cycle_seconds
+            for duration, pitch in phases:
+                if phase_time < duration:
+                    break
+                phase_time -= duration
+            if pitch is not None:
+                noise = 8.0 * math.sin(frame_index * 0.7 + face_index)
+                faces.append(make_synthetic_face(pitch + noise, nose_x=(face_index + 0.5) / num_faces))
+        stream.append(faces or None)
+    return stream
+
+
+def make_scratch_config_service():
+    """A HeadPoseMonitor config service backed by the scratch working directory rather than put_it_down_detector/config.json."""
+    from put_it_down_detector.detector import create_config_service
+    return create_config_service(os.path.join(os.getcwd(), SCRATCH_CONFIG_FILE))
+
+
+def bench_head_pose_state_tracking(quick):
+    from put_it_down_detector.detector import HeadPoseMonitor
+    results = []
+    face_counts = [1] if quick else [1, 4]
+    smoothing_windows = [0.5, 5.0]
+    for num_faces in face_counts:
+        stream = make_synthetic_stream(num_faces)
+        for smoothing_window in smoothing_windows:
+            # No camera or model; warm_up() is never called
+            monitor = HeadPoseMonitor(max_num_faces=num_faces, config_service=make_scratch_config_service())
+            monitor.pitch_smoothing_window_seconds = smoothing_window
+            for subject in monitor.subjects:
+                subject.reset_clock(0.0) # The synthetic stream's clock starts at 0
+            clock = {"frame": 0}
+
+            def process_one_frame():
+                frame_index = clock["frame"]
+                clock["frame"] += 1
+                monitor.update_subjects(stream[frame_index % len(stream)], frame_index / FRAME_RATE)
+
+            stats = measure(process_one_frame)
+            results.append(result("head_pose_monitor.update_subjects",
+                                  {"faces": num_faces, "smoothing_window_s": smoothing_window}, stats))
+    return results
+
+
+def get_benchmarks(quick):
+    window_counts = QUICK_WINDOW_COUNTS if quick else WINDOW_COUNTS
+    return [
+        ("distraction_detector.update_open_apps", lambda: bench_update_open_apps(window_counts)),
+        ("distraction_detector.get_formatted_app_durations_for_display", lambda: bench_formatted_durations(window_counts)),
+        ("distraction_detector.update_focus", bench_update_focus),
+        ("head_pose_monitor.update_subjects", lambda: bench_head_pose_state_tracking(quick)),
+    ]
@@ -0,0 +1,115 @@
+"""Benchmarks for frame conversion, face mesh overlay drawing and the dashboard pie chart redraw."""
+import math
+
+from benchmarks.run_benchmarks import measure, result, skipped
+from benchmarks.bench_detectors import make_scratch_config_service
+
+FRAME_WIDTH = 640
+FRAME_HEIGHT = 480
+DISPLAY_WIDTH = 480 # Typical video label size in the dashboard
+DISPLAY_HEIGHT = 360
+NUM_LANDMARKS = 478
+
+
+def _make_frame():
+    import numpy as np
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, size=(FRAME_HEIGHT, FRAME_WIDTH, 3), dtype=np.uint8)
+
+
+def _make_monitor():
+    from put_it_down_detector import detector
+    detector._import_heavy_modules()
+    # No camera is opened; warm_up() is never called
+    return detector, detector.HeadPoseMonitor(config_service=make_scratch_config_service())
+
+
+def bench_frame_conversion(quick):
+    try:
+        _, monitor = _make_monitor()
+        frame = _make_frame()
+    except ImportError as e:
+        return [skipped("frame_conversion", f"missing dependency: {e}")]
+
+    results = []
+    for processing_scale in ([1.0] if quick else [1.0, 0.75, 0.5]):
+        monitor.set_processing_options(processing_scale=processing_scale)
+        stats = measure(lambda: monitor._prepare_frame(frame))
+        results.append(result("frame_conversion.prepare_frame", {"processing_scale": processing_scale}, stats))
+
+    try:
+        from main_dashboard import frame_to_display_image
+    except ImportError as e:
+        results.append(skipped("frame_conversion.to_display_image", f"missing dependency: {e}"))
+        return results
+    stats = measure(lambda: frame_to_display_image(frame, DISPLAY_WIDTH, DISPLAY_HEIGHT))
+    results.append(result("frame_conversion.to_display_image",
+                          {"display_size": f"{DISPLAY_WIDTH}x{DISPLAY_HEIGHT}"}, stats))
+    return results
+
+
+def _make_landmark_list(center_x):
+    from mediapipe.framework.formats import landmark_pb2
+    landmark_list = landmark_pb2.NormalizedLandmarkList()
+    for i in range(NUM_LANDMARKS):
+        angle = 2.0 * math.pi * i / NUM_LANDMARKS
+        radius = 0.05 + 0.1 * ((i * 7) % NUM_LANDMARKS) / NUM_LANDMARKS
+        landmark_list.landmark.add(x=center_x + radius * math.cos(angle), y=0.5 + 1.2 * radius * math.sin(angle), z=0.0)
+    return landmark_list
+
+
+def bench_overlay_drawing(quick):
+    try:
+        detector, monitor = _make_monitor()
+        monitor._load_model()
+        frame = _make_frame()
+    except ImportError as e:
+        return [skipped("overlay_drawing", f"missing dependency: {e}")]
+
+    results = []
+    overlay_levels = [detector.OVERLAY_FULL, detector.OVERLAY_CONTOURS, detector.OVERLAY_NONE]
+    for num_faces in ([1] if quick else [1, 4]):
+        faces = [_make_landmark_list((i + 0.5) / num_faces) for i in range(num_faces)]
+        for overlay_level in overlay_levels:
+            monitor.set_processing_options(overlay_level=overlay_level)
+            annotated_frame = frame.copy()
+            stats = measure(lambda: monitor._draw_overlay(annotated_frame, faces))
+            results.append(result("overlay_drawing.draw_overlay", {"faces": num_faces, "overlay_level": overlay_level}, stats))
+    monitor.release_resources()
+    return results
+
+
+def bench_pie_chart(quick):
+    try:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from main_dashboard import draw_time_distribution_pie, FIGURE_WIDTH_INCHES, FIGURE_HEIGHT_INCHES, FIGURE_DPI
+    except ImportError as e:
+        return [skipped("pie_chart", f"missing dependency: {e}")]
+
+    # Same figure as MainDashboard._create_pie_chart, rendered with Agg instead of TkAgg so no display is needed
+    fig = Figure(figsize=(FIGURE_WIDTH_INCHES, FIGURE_HEIGHT_INCHES), dpi=FIGURE_DPI)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    cases = {
+        "no_data": {},
+        "all_states": {"total_time_on_screen": 600.0, "total_time_on_phone": 120.0,
+                       "total_time_limbo": 30.0, "total_time_no_face": 45.0},
+    }
+    results = []
+    for case_name, status_info in cases.items():
+        # _update_pie_chart schedules draw_idle(); the render it triggers is canvas.draw()
+        def redraw():
+            draw_time_distribution_pie(ax, status_info)
+            canvas.draw()
+        stats = measure(redraw, repeat=3)
+        results.append(result("pie_chart.update_pie_chart", {"case": case_name}, stats))
+    return results
+
+
+def get_benchmarks(quick):
+    return [
+        ("frame_conversion", lambda: bench_frame_conversion(quick)),
+        ("overlay_drawing", lambda: bench_overlay_drawing(quick)),
+        ("pie_chart", lambda: bench_pie_chart(quick)),
+    ]
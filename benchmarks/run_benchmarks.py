@@ -0,0 +1,196 @@
+"""
+Headless performance benchmarks for the detectors and dashboard rendering.
+
+Run from the project root (or as python benchmarks/run_benchmarks.py):
+    python -m benchmarks.run_benchmarks                       # full run, writes benchmark_results.json
+    python -m benchmarks.run_benchmarks --quick --only pie    # smaller sizes, only matching benchmarks
+    python -m benchmarks.run_benchmarks --compare old.json    # flag regressions against an earlier run
+
+Results are JSON so runs can be compared; see compare_results().
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+# Make the project importable however this script is started, including after the chdir in main()
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+DEFAULT_OUTPUT_FILE = "benchmark_results.json"
+DEFAULT_REGRESSION_THRESHOLD = 1.25 # New median / old median above this counts as a regression
+MIN_BATCH_SECONDS = 0.05 # Each repeat runs the function enough times to last at least this long
+
+
+def measure(func, repeat=5, min_batch_seconds=MIN_BATCH_SECONDS):
+    """
+    Times func() and returns per-call statistics in seconds.
+    Calls are batched so that timer resolution does not dominate fast functions.
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_batch_seconds or number >= 1000000:
+            break
+        number *= 10 if elapsed < min_batch_seconds / 10 else 2
+
+    per_call_times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        per_call_times.append((time.perf_counter() - start) / number)
+    return {
+        "number": number,
+        "repeat": repeat,
+        "min_s": min(per_call_times),
+        "median_s": statistics.median(per_call_times),
+        "mean_s": statistics.mean(per_call_times)
+    }
+
+
+def result(name, params, stats):
+    return {"name": name, "params": params, "status": "ok", **stats}
+
+
+def skipped(name, reason):
+    return {"name": name, "params": {}, "status": "skipped", "reason": reason}
+
+
+def _result_key(entry):
+    return entry["name"] + json.dumps(entry.get("params", {}), sort_keys=True)
+
+
+def _describe(entry):
+    params = ", ".join(f"{k}={v}" for k, v in entry["params"].items())
+    return f"{entry['name']}({params})"
+
+
+def compare_results(baseline, current, threshold=DEFAULT_REGRESSION_THRESHOLD):
+    """
+    Returns (lines, regression_count) comparing the median of every benchmark present in both runs.
+    Benchmarks found in only one of the runs are listed as new or missing rather than skipped silently.
+    """
+    lines = []
+    baseline_quick = baseline.get("metadata", {}).get("quick")
+    current_quick = current.get("metadata", {}).get("quick")
+    if baseline_quick != current_quick:
+        lines.append(f"WARNING: baseline quick={baseline_quick}, this run quick={current_quick}; "
+                     "sizes only measured in one of them are not compared")
+
+    baseline_by_key = {_result_key(entry): entry for entry in baseline["results"] if entry["status"] == "ok"}
+    current_keys = set()
+    regressions = 0
+    compared = 0
+    for entry in current["results"]:
+        if entry["status"] != "ok":
+            continue
+        current_keys.add(_result_key(entry))
+        old = baseline_by_key.get(_result_key(entry))
+        if old is None:
+            lines.append(f"{_describe(entry)}: new, not in baseline")
+            continue
+        compared += 1
+        ratio = entry["median_s"] / old["median_s"] if old["median_s"] > 0 else float("inf")
+        flag = ""
+        if ratio > threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif ratio < 1.0 / threshold:
+            flag = "  faster"
+        lines.append(f"{_describe(entry)}: {old['median_s'] * 1e6:.1f}us -> {entry['median_s'] * 1e6:.1f}us ({ratio:.2f}x){flag}")
+    for key, old in baseline_by_key.items():
+        if key not in current_keys:
+            lines.append(f"{_describe(old)}: missing from this run")
+    lines.append(f"{compared} benchmark(s) compared")
+    return lines, regressions
+
+
+def collect_benchmarks(quick):
+    # Imported here so that --help works without the project's dependencies
+    from benchmarks import bench_detectors, bench_rendering
+    return bench_detectors.get_benchmarks(quick) + bench_rendering.get_benchmarks(quick)
+
+
+def run(only=None, quick=False):
+    results = []
+    for name, bench_func in collect_benchmarks(quick):
+        if only and not any(pattern in name for pattern in only):
+            continue
+        print(f"Running {name}...", file=sys.stderr)
+        # The detectors print on every state change; keep that out of the timings and the report
+        with contextlib.redirect_stdout(io.StringIO()):
+            try:
+                bench_results = bench_func()
+            except ImportError as e:
+                bench_results = [skipped(name, f"missing dependency: {e}")]
+        for entry in bench_results:
+            if entry["status"] == "ok":
+                print(f"  {_describe(entry)}: median {entry['median_s'] * 1e6:.1f}us", file=sys.stderr)
+            else:
+                print(f"  {entry['name']}: skipped ({entry['reason']})", file=sys.stderr)
+        results.extend(bench_results)
+    return {
+        "metadata": {
+            "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S'),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "quick": quick
+        },
+        "results": results
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run Put It Down performance benchmarks.")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT_FILE, help="Where to write the JSON results.")
+    parser.add_argument("--compare", help="Earlier results file to compare against.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help="Slowdown ratio that counts as a regression when comparing.")
+    parser.add_argument("--quick", action="store_true", help="Smaller sizes (up to 1000 windows, one face).")
+    parser.add_argument("--only", action="append", help="Only run benchmarks whose name contains this (repeatable).")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 if a regression is found.")
+    args = parser.parse_args(argv)
+
+    output_path = os.path.abspath(args.output)
+    compare_path = os.path.abspath(args.compare) if args.compare else None
+
+    # DistractionDetector and CpuGovernor keep their config files in the working directory, and the
+    # benchmarks point HeadPoseMonitor there too; run in a scratch directory so no user config is touched.
+    original_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as scratch_dir:
+        os.chdir(scratch_dir)
+        try:
+            current = run(only=args.only, quick=args.quick)
+        finally:
+            os.chdir(original_cwd)
+
+    with open(output_path, 'w') as f:
+        json.dump(current, f, indent=4)
+    print(f"Wrote {len(current['results'])} results to {output_path}", file=sys.stderr)
+
+    if compare_path:
+        with open(compare_path, 'r') as f:
+            baseline = json.load(f)
+        lines, regressions = compare_results(baseline, current, args.threshold)
+        print("\n".join(lines))
+        print(f"{regressions} regression(s) over {args.threshold:.2f}x")
+        if regressions and args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
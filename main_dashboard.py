@@ -1,30 +1,99 @@
+import time
+APP_START_TIME = time.perf_counter() # Reference point for the startup-time breakdown
+
 import tkinter as tk
 from tkinter import ttk, Listbox, Scrollbar, Button, Label, Frame, messagebox
 import threading
-import time
 import os
-import cv2 
 from PIL import Image, ImageTk
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib # Matplotlib backend setting for Tkinter
-matplotlib.use('TkAgg')
+# cv2, mediapipe and matplotlib are imported lazily (see frame_to_display_image and _create_pie_chart) so the window appears quickly
 
 
 # Assuming DistractionDetector.py is in the same directory (project root)
-from DistractionDetector import DistractionDetector
-# Assuming detector.py (now HeadPoseMonitor) is in put_it_down_detector subdirectory
-from put_it_down_detector.detector import HeadPoseMonitor
+from DistractionDetector import DistractionDetector, FOCUS_SAMPLE_INTERVAL_SECONDS
+# HeadPoseMonitor (put_it_down_detector/detector.py) instances are managed by MultiCameraMonitor
+from put_it_down_detector.multi_camera import MultiCameraMonitor
+from ActivityCorrelator import ActivityCorrelator
+from CpuGovernor import CpuGovernor, GOVERNOR_SAMPLE_INTERVAL_SECONDS
+
+FIGURE_DPI = 100
+FIGURE_WIDTH_INCHES = 3.5  # Approx 350px wide
+FIGURE_HEIGHT_INCHES = 2.6 # Approx 260px tall
+
+
+def frame_to_display_image(frame, max_width, max_height):
+    """Converts an annotated BGR frame to a PIL image that fits within max_width x max_height."""
+    import cv2 # Already loaded by HeadPoseMonitor.warm_up()
+    img = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    if max_width > 1 and max_height > 1: 
+        img.thumbnail((max_width, max_height), Image.Resampling.LANCZOS)
+    return img
+
+def draw_time_distribution_pie(ax, status_info):
+    """Draws the head pose time distribution from status_info onto a matplotlib Axes."""
+    labels = ['On Screen', 'On Phone', 'Limbo', 'No Face']
+    times = [
+        status_info.get('total_time_on_screen', 0.0),
+        status_info.get('total_time_on_phone', 0.0),
+        status_info.get('total_time_limbo', 0.0),
+        status_info.get('total_time_no_face', 0.0)
+    ]
+
+    active_labels = []
+    active_times = []
+    for i, time_val in enumerate(times):
+        if time_val > 0.01: 
+            active_labels.append(labels[i])
+            active_times.append(time_val)
+
+    ax.clear() 
+
+    if not active_times or sum(active_times) == 0:
+        ax.text(0.5, 0.5, 'No time data yet', horizontalalignment='center', verticalalignment='center', transform=ax.transAxes)
+    else:
+        color_map = {'On Screen': '#4CAF50', 'On Phone': '#FFC107', 'Limbo': '#2196F3', 'No Face': '#9E9E9E'}
+        pie_colors = [color_map.get(label, '#CCCCCC') for label in active_labels]
+
+        wedges, texts, autotexts = ax.pie(
+            active_times, 
+            labels=None, 
+            autopct='%1.1f%%', 
+            startangle=90,
+            colors=pie_colors,
+            pctdistance=0.85 
+        )
+        for text_obj in autotexts:
+            text_obj.set_fontsize(7)
+            text_obj.set_color("white")
+
+        # Legend temporarily removed for diagnosing shrinking issue
+        # legend = ax.legend(wedges, active_labels, title="States", loc="best", fontsize='x-small')
+        # try:
+        #     if legend: legend.get_title().set_fontsize('x-small')
+        # except AttributeError:
+        #     pass 
+
+    ax.axis('equal')  
+    # Removed tight_layout() call
 
 
 class MainDashboard(tk.Tk):
     def __init__(self):
+        self.startup_timings = {"imports": time.perf_counter() - APP_START_TIME}
         super().__init__()
         self.title("Comprehensive Monitoring Dashboard")
         self.geometry("1000x700") 
 
         self.distraction_detector = DistractionDetector()
-        self.head_pose_monitor = HeadPoseMonitor()
+        # Cameras and faces per camera come from config.json ("webcam_ids", "max_num_faces").
+        # The video feed, labels and correlator follow the primary (first open) camera's primary subject.
+        self.multi_camera_monitor = MultiCameraMonitor()
+        self.activity_correlator = ActivityCorrelator()
+        self.cpu_governor = CpuGovernor()
+        self.governor_settings = self.cpu_governor.get_settings()
+        self.last_label_update_time = 0.0
+        self.last_pie_update_time = 0.0
+        self.syncing_controls = True # Set while sliders are moved to match the config files, including below
         
         self.paned_window = ttk.PanedWindow(self, orient=tk.HORIZONTAL)
         self.paned_window.pack(fill=tk.BOTH, expand=True)
@@ -41,29 +110,23 @@ class MainDashboard(tk.Tk):
         # --- Pie Chart for Time Distribution (Fixed Size Container) ---
         self.pie_chart_frame = ttk.LabelFrame(self.left_pane, text="Time Distribution")
         
-        FIGURE_DPI = 100
-        FIGURE_WIDTH_INCHES = 3.5  # Approx 350px wide
-        FIGURE_HEIGHT_INCHES = 2.6 # Approx 260px tall
-        
         frame_width_px = int(FIGURE_WIDTH_INCHES * FIGURE_DPI)
         frame_height_px = int(FIGURE_HEIGHT_INCHES * FIGURE_DPI)
         
         self.pie_chart_frame.config(width=frame_width_px, height=frame_height_px) 
         self.pie_chart_frame.pack_propagate(False) 
         self.pie_chart_frame.pack(side=tk.BOTTOM, fill=tk.X, expand=False, padx=5, pady=5) 
-
-        self.fig_pie = Figure(figsize=(FIGURE_WIDTH_INCHES, FIGURE_HEIGHT_INCHES), dpi=FIGURE_DPI) 
-        self.ax_pie = self.fig_pie.add_subplot(111)
-
-        self.canvas_pie = FigureCanvasTkAgg(self.fig_pie, master=self.pie_chart_frame)
-        self.canvas_pie_widget = self.canvas_pie.get_tk_widget()
-        self.canvas_pie_widget.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        # The matplotlib figure is created by _create_pie_chart() once the window has been painted
+        self.fig_pie = None
+        self.ax_pie = None
+        self.canvas_pie = None
+        self.canvas_pie_widget = None
 
         # Head Pose Info Frame (Packed below pie chart)
         hpm_info_frame = ttk.LabelFrame(self.left_pane, text="Head Pose Analysis")
         hpm_info_frame.pack(side=tk.BOTTOM, fill=tk.X, padx=5, pady=5) 
         
-        self.hpm_status_label = Label(hpm_info_frame, text="Status: Initializing...", font=("Arial", 10))
+        self.hpm_status_label = Label(hpm_info_frame, text="Status: Warming up...", font=("Arial", 10))
         self.hpm_status_label.pack(anchor=tk.W, padx=5, pady=(5,0)) 
         self.hpm_pitch_label = Label(hpm_info_frame, text="Pitch (S/R): N/A / N/A", font=("Arial", 9))
         self.hpm_pitch_label.pack(anchor=tk.W, padx=5)
@@ -78,6 +141,10 @@ class MainDashboard(tk.Tk):
         self.hpm_time_limbo_label.pack(anchor=tk.W, padx=5)
         self.hpm_time_no_face_label = Label(hpm_info_frame, text="No Face: 0.0s", font=("Arial", 9))
         self.hpm_time_no_face_label.pack(anchor=tk.W, padx=5, pady=(0,5))
+        self.subjects_listbox = Listbox(hpm_info_frame, height=3, font=("Arial", 8))
+        self.subjects_listbox.pack(fill=tk.X, padx=5, pady=(0,5))
+        self.startup_label = Label(hpm_info_frame, text="Startup: measuring...", font=("Arial", 8), fg="grey")
+        self.startup_label.pack(anchor=tk.W, padx=5, pady=(0,5))
 
         # --- Right Pane ---
         self.right_pane = ttk.Frame(self.paned_window, width=350) 
@@ -86,27 +153,39 @@ class MainDashboard(tk.Tk):
         hpm_controls_frame = ttk.LabelFrame(self.right_pane, text="Head Pose Controls")
         hpm_controls_frame.pack(fill=tk.X, padx=10, pady=5)
         
-        current_thresholds = self.head_pose_monitor.get_current_thresholds()
+        current_thresholds = self.multi_camera_monitor.primary_monitor.get_current_thresholds()
 
         Label(hpm_controls_frame, text="Pitch Threshold:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=2)
         self.pitch_scale = tk.Scale(hpm_controls_frame, from_=0, to=200, orient=tk.HORIZONTAL,
-                                    command=lambda v: self.head_pose_monitor.update_pitch_threshold(v))
+                                    command=lambda v: self._on_slider(self.multi_camera_monitor.update_pitch_threshold, v))
         self.pitch_scale.set(current_thresholds["pitch_threshold"])
         self.pitch_scale.grid(row=0, column=1, sticky=tk.EW, padx=5, pady=2)
 
         Label(hpm_controls_frame, text="Time Threshold (s):").grid(row=1, column=0, sticky=tk.W, padx=5, pady=2)
         self.time_scale = tk.Scale(hpm_controls_frame, from_=1, to=30, orient=tk.HORIZONTAL,
-                                   command=lambda v: self.head_pose_monitor.update_time_threshold(v))
+                                   command=lambda v: self._on_slider(self.multi_camera_monitor.update_time_threshold, v))
         self.time_scale.set(current_thresholds["time_threshold_seconds"])
         self.time_scale.grid(row=1, column=1, sticky=tk.EW, padx=5, pady=2)
 
         Label(hpm_controls_frame, text="Smoothing (0.1s):").grid(row=2, column=0, sticky=tk.W, padx=5, pady=2)
         self.smooth_scale = tk.Scale(hpm_controls_frame, from_=0, to=50, orient=tk.HORIZONTAL, 
-                                     command=lambda v: self.head_pose_monitor.update_smoothing_window(v))
+                                     command=lambda v: self._on_slider(self.multi_camera_monitor.update_smoothing_window, v))
         self.smooth_scale.set(current_thresholds["pitch_smoothing_window_seconds"] * 10)
         self.smooth_scale.grid(row=2, column=1, sticky=tk.EW, padx=5, pady=2)
         hpm_controls_frame.columnconfigure(1, weight=1)
 
+        governor_frame = ttk.LabelFrame(self.right_pane, text="CPU Governor")
+        governor_frame.pack(fill=tk.X, padx=10, pady=5)
+
+        Label(governor_frame, text="CPU Budget (%):").grid(row=0, column=0, sticky=tk.W, padx=5, pady=2)
+        self.cpu_budget_scale = tk.Scale(governor_frame, from_=1, to=100, orient=tk.HORIZONTAL,
+                                         command=lambda v: self._on_slider(self.cpu_governor.update_cpu_budget, v))
+        self.cpu_budget_scale.set(self.cpu_governor.cpu_budget_percent)
+        self.cpu_budget_scale.grid(row=0, column=1, sticky=tk.EW, padx=5, pady=2)
+        self.governor_status_label = Label(governor_frame, text=self.cpu_governor.get_status_text(), font=("Arial", 8), justify=tk.LEFT)
+        self.governor_status_label.grid(row=1, column=0, columnspan=2, sticky=tk.W, padx=5, pady=(0,5))
+        governor_frame.columnconfigure(1, weight=1)
+
         tracked_apps_frame = ttk.LabelFrame(self.right_pane, text="Tracked Applications")
         tracked_apps_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5) 
 
@@ -116,6 +195,15 @@ class MainDashboard(tk.Tk):
         tracked_apps_scrollbar.pack(side=tk.RIGHT, fill=tk.Y, padx=(0,5), pady=5)
         self.tracked_apps_listbox.config(yscrollcommand=tracked_apps_scrollbar.set)
 
+        distraction_apps_frame = ttk.LabelFrame(self.right_pane, text="Focused Apps While On Phone")
+        distraction_apps_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+        self.distraction_apps_listbox = Listbox(distraction_apps_frame, height=4)
+        self.distraction_apps_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(5,0), pady=5)
+        distraction_apps_scrollbar = Scrollbar(distraction_apps_frame, orient=tk.VERTICAL, command=self.distraction_apps_listbox.yview)
+        distraction_apps_scrollbar.pack(side=tk.RIGHT, fill=tk.Y, padx=(0,5), pady=5)
+        self.distraction_apps_listbox.config(yscrollcommand=distraction_apps_scrollbar.set)
+
         block_manager_frame = ttk.LabelFrame(self.right_pane, text="Block List Manager")
         block_manager_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5) 
         
@@ -143,43 +231,107 @@ class MainDashboard(tk.Tk):
         blocked_list_scrollbar = Scrollbar(blocked_list_frame, orient=tk.VERTICAL, command=self.blocked_listbox.yview)
         blocked_list_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.blocked_listbox.config(yscrollcommand=blocked_list_scrollbar.set)
+        self.update_idletasks() # Deliver the callbacks from the initial Scale.set() calls while they are ignored
+        self.syncing_controls = False
         
         self.running = True
         self.hpm_thread = threading.Thread(target=self._hpm_loop, daemon=True)
         self.hpm_thread.start()
         self.app_tracking_thread = threading.Thread(target=self._app_tracking_loop, daemon=True)
         self.app_tracking_thread.start()
+        self.focus_sampling_thread = threading.Thread(target=self._focus_sampling_loop, daemon=True)
+        self.focus_sampling_thread.start()
+        self.governor_thread = threading.Thread(target=self._governor_loop, daemon=True)
+        self.governor_thread.start()
         
         self.protocol("WM_DELETE_WINDOW", self._on_closing)
         self._update_block_management_ui() 
+        self.startup_timings["window_build"] = time.perf_counter() - APP_START_TIME - self.startup_timings["imports"]
+        # An idle callback can run before the window is even mapped, so wait for the root window's first Expose
+        self._first_expose_binding = self.bind("<Expose>", self._on_first_paint, add="+")
+
+    def _on_first_paint(self, event):
+        # Child widgets' Expose events also reach the root's bindings; only the root window's own counts
+        if event.widget is not self or self._first_expose_binding is None: return
+        self.unbind("<Expose>", self._first_expose_binding)
+        self._first_expose_binding = None
+        self.update_idletasks() # Finish drawing the widgets before taking the time
+        self.startup_timings["first_paint"] = time.perf_counter() - APP_START_TIME
+        print(f"Dashboard startup: imports={self.startup_timings['imports']:.2f}s, "
+              f"window_build={self.startup_timings['window_build']:.2f}s, first_paint={self.startup_timings['first_paint']:.2f}s")
+        # Queue the pie chart first so building the label text never delays it
+        self.after(50, self._create_pie_chart)
+        self._update_startup_label()
+
+    def _create_pie_chart(self):
+        if not self.running: return
+        step_start = time.perf_counter()
+        import matplotlib # Matplotlib backend setting for Tkinter
+        matplotlib.use('TkAgg')
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+        self.fig_pie = Figure(figsize=(FIGURE_WIDTH_INCHES, FIGURE_HEIGHT_INCHES), dpi=FIGURE_DPI) 
+        self.ax_pie = self.fig_pie.add_subplot(111)
+
+        self.canvas_pie = FigureCanvasTkAgg(self.fig_pie, master=self.pie_chart_frame)
+        self.canvas_pie_widget = self.canvas_pie.get_tk_widget()
+        self.canvas_pie_widget.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        self.startup_timings["pie_chart"] = time.perf_counter() - step_start
+        self._update_startup_label()
+
+    def _update_startup_label(self):
+        if not self.running or not self.startup_label.winfo_exists(): return
+        timings = dict(self.startup_timings)
+        timings.update({f"hpm_{name}": seconds for name, seconds in self.multi_camera_monitor.primary_monitor.get_startup_timings().items()})
+        self.startup_label.config(text="Startup: " + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in timings.items()))
 
     def _hpm_loop(self):
+        self.after(0, self._update_hpm_status_labels, {"status": "Warming up..."})
+        try:
+            self.multi_camera_monitor.warm_up()
+        except Exception as e:
+            # e.g. cv2/mediapipe missing or broken; the rest of the dashboard keeps working
+            print(f"HPM loop: Warm-up failed: {e}")
+            if self.running: self.after(0, self._update_hpm_status_labels, {"status": f"Head pose unavailable: {e}"})
+            return
+        if self.running: self.after(0, self._update_startup_label)
+        # Cameras are processed on the monitor's worker pool, each on its own schedule; this loop only shows the results
+        self.multi_camera_monitor.start(self.governor_settings["inference_fps"])
+        last_shown_frame = None
         while self.running:
-            if self.head_pose_monitor and self.head_pose_monitor.cap and self.head_pose_monitor.cap.isOpened():
-                frame, status_info = self.head_pose_monitor.process_next_frame()
+            loop_start = time.perf_counter()
+            primary_monitor = self.multi_camera_monitor.primary_monitor
+            latest = self.multi_camera_monitor.get_latest_result(primary_monitor)
+            status_info = None
+            if not primary_monitor.is_camera_open():
+                # MultiCameraMonitor retries closed cameras with backoff; keep showing the last totals meanwhile
+                status_info = dict(primary_monitor.subjects[0].get_status_info(), status="Webcam not available, retrying...")
+            elif (primary_monitor.webcam_id, latest["frame_number"]) != last_shown_frame and latest["status_info"]:
+                last_shown_frame = (primary_monitor.webcam_id, latest["frame_number"])
+                # The governor checks the real frame interval, not just the nominal fps, against its timing tolerance
+                if latest["loop_interval"] is not None:
+                    self.cpu_governor.record_loop_timing(latest["loop_interval"], latest["processing_time"])
+                status_info = dict(latest["status_info"])
+                status_info["all_subjects"] = [
+                    subject_info for monitor in self.multi_camera_monitor.monitors
+                    for subject_info in self.multi_camera_monitor.get_latest_result(monitor)["status_info"].get("subjects", [])
+                ]
+                frame = latest["frame"]
                 if frame is not None:
                     try:
-                        cv2image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                        img = Image.fromarray(cv2image)
-                        
-                        label_width = self.video_label.winfo_width()
-                        label_height = self.video_label.winfo_height()
-                        if label_width > 1 and label_height > 1: 
-                            img.thumbnail((label_width, label_height), Image.Resampling.LANCZOS)
-
+                        img = frame_to_display_image(frame, self.video_label.winfo_width(), self.video_label.winfo_height())
                         imgtk = ImageTk.PhotoImage(image=img)
                         self.after(0, self._update_video_label, imgtk) 
                     except Exception as e:
                         print(f"Error updating video label: {e}")
                 
-                if status_info:
-                    self.after(0, self._update_hpm_status_labels, status_info)
-            else:
-                print("HPM loop: Webcam not available. Retrying in 5s...")
-                time.sleep(5)
-                if self.running and not (self.head_pose_monitor.cap and self.head_pose_monitor.cap.isOpened()):
-                     self.head_pose_monitor._initialize_resources()
-            time.sleep(0.03) 
+            # Time totals are accumulated every frame by the workers; only the label refresh is throttled
+            if status_info and time.time() - self.last_label_update_time >= self.governor_settings["label_refresh_seconds"]:
+                self.last_label_update_time = time.time()
+                self.after(0, self._update_hpm_status_labels, status_info)
+            frame_interval = 1.0 / self.governor_settings["inference_fps"]
+            time.sleep(max(0.0, frame_interval - (time.perf_counter() - loop_start)))
 
     def _update_video_label(self, imgtk):
         if not self.running or not self.video_label.winfo_exists(): return
@@ -203,65 +355,79 @@ class MainDashboard(tk.Tk):
         if self.hpm_time_no_face_label.winfo_exists():
             self.hpm_time_no_face_label.config(text=f"No Face: {status_info.get('total_time_no_face', 0.0):.1f}s")
         
-        self._update_pie_chart(status_info)
+        if "all_subjects" in status_info and self.subjects_listbox.winfo_exists():
+            self.subjects_listbox.delete(0, tk.END)
+            for subject_info in status_info["all_subjects"]:
+                self.subjects_listbox.insert(tk.END,
+                    f"{subject_info['subject_id']}: {subject_info['status']} - "
+                    f"phone {subject_info['total_time_on_phone']:.0f}s / screen {subject_info['total_time_on_screen']:.0f}s")
+        
+        if time.time() - self.last_pie_update_time >= self.governor_settings["pie_refresh_seconds"]:
+            self.last_pie_update_time = time.time()
+            self._update_pie_chart(status_info)
 
     def _update_pie_chart(self, status_info):
-        if not self.running or not self.canvas_pie_widget.winfo_exists(): return
-
-        labels = ['On Screen', 'On Phone', 'Limbo', 'No Face']
-        times = [
-            status_info.get('total_time_on_screen', 0.0),
-            status_info.get('total_time_on_phone', 0.0),
-            status_info.get('total_time_limbo', 0.0),
-            status_info.get('total_time_no_face', 0.0)
-        ]
-        
-        active_labels = []
-        active_times = []
-        for i, time_val in enumerate(times):
-            if time_val > 0.01: 
-                active_labels.append(labels[i])
-                active_times.append(time_val)
-
-        self.ax_pie.clear() 
-
-        if not active_times or sum(active_times) == 0:
-            self.ax_pie.text(0.5, 0.5, 'No time data yet', horizontalalignment='center', verticalalignment='center', transform=self.ax_pie.transAxes)
-        else:
-            color_map = {'On Screen': '#4CAF50', 'On Phone': '#FFC107', 'Limbo': '#2196F3', 'No Face': '#9E9E9E'}
-            pie_colors = [color_map.get(label, '#CCCCCC') for label in active_labels]
-
-            wedges, texts, autotexts = self.ax_pie.pie(
-                active_times, 
-                labels=None, 
-                autopct='%1.1f%%', 
-                startangle=90,
-                colors=pie_colors,
-                pctdistance=0.85 
-            )
-            for text_obj in autotexts:
-                text_obj.set_fontsize(7)
-                text_obj.set_color("white")
-            
-            # Legend temporarily removed for diagnosing shrinking issue
-            # legend = self.ax_pie.legend(wedges, active_labels, title="States", loc="best", fontsize='x-small')
-            # try:
-            #     if legend: legend.get_title().set_fontsize('x-small')
-            # except AttributeError:
-            #     pass 
-
-        self.ax_pie.axis('equal')  
-        # Removed tight_layout() call
+        if not self.running or self.canvas_pie_widget is None or not self.canvas_pie_widget.winfo_exists(): return
+
+        draw_time_distribution_pie(self.ax_pie, status_info)
         
         if self.canvas_pie_widget.winfo_exists():
             self.canvas_pie.draw_idle()
 
     def _app_tracking_loop(self):
         while self.running:
+            self.distraction_detector.check_block_list_for_external_changes()
+            if self.cpu_governor.config_service.check_for_external_changes():
+                if self.running: self.after(0, self._sync_governor_controls)
+            if self.multi_camera_monitor.primary_monitor.check_config_for_external_changes():
+                if self.running: self.after(0, self._sync_hpm_controls)
             self.distraction_detector.update_open_apps()
+            self._update_activity_correlation()
             if self.running: self.after(0, self._update_tracked_apps_listbox)
+            if self.running: self.after(0, self._update_distraction_apps_listbox)
             if self.running: self.after(0, self._update_block_management_ui)
-            time.sleep(2)
+            time.sleep(self.governor_settings["app_poll_seconds"])
+
+    def _on_slider(self, update_func, val):
+        if self.syncing_controls: return
+        update_func(val)
+
+    def _sync_hpm_controls(self):
+        # Scale.set() rounds to the slider resolution and fires the callback (possibly later, from the
+        # event loop); ignore it so a rounded value never overwrites the config that was just loaded
+        if not self.running: return
+        current_thresholds = self.multi_camera_monitor.primary_monitor.get_current_thresholds()
+        self.syncing_controls = True
+        self.pitch_scale.set(current_thresholds["pitch_threshold"])
+        self.time_scale.set(current_thresholds["time_threshold_seconds"])
+        self.smooth_scale.set(current_thresholds["pitch_smoothing_window_seconds"] * 10)
+        self.update_idletasks()
+        self.syncing_controls = False
+
+    def _sync_governor_controls(self):
+        if not self.running: return
+        self.syncing_controls = True
+        self.cpu_budget_scale.set(self.cpu_governor.cpu_budget_percent)
+        self.update_idletasks()
+        self.syncing_controls = False
+
+    def _governor_loop(self):
+        while self.running:
+            time.sleep(GOVERNOR_SAMPLE_INTERVAL_SECONDS)
+            settings = self.cpu_governor.update()
+            self.multi_camera_monitor.set_processing_options(settings["processing_scale"], settings["overlay_level"])
+            self.multi_camera_monitor.set_frame_rate(settings["inference_fps"])
+            self.governor_settings = settings
+            if self.running: self.after(0, self._update_governor_label)
+
+    def _update_governor_label(self):
+        if not self.running or not self.governor_status_label.winfo_exists(): return
+        self.governor_status_label.config(text=self.cpu_governor.get_status_text())
+
+    def _focus_sampling_loop(self):
+        while self.running:
+            self.distraction_detector.update_focus()
+            time.sleep(FOCUS_SAMPLE_INTERVAL_SECONDS)
 
     def _update_tracked_apps_listbox(self):
         if not self.running or not self.tracked_apps_listbox.winfo_exists(): return
@@ -270,6 +436,21 @@ class MainDashboard(tk.Tk):
         for item in tracked_apps_formatted:
             self.tracked_apps_listbox.insert(tk.END, item)
 
+    def _update_activity_correlation(self):
+        # Focus intervals must be ingested before the pose intervals that are joined against them
+        completed_focus_intervals, current_focus_session = self.distraction_detector.pop_focus_state()
+        self.activity_correlator.ingest_app_intervals(completed_focus_intervals)
+        self.activity_correlator.set_open_app_sessions(current_focus_session)
+        self.activity_correlator.ingest_state_intervals(self.multi_camera_monitor.pop_completed_state_intervals())
+
+    def _update_distraction_apps_listbox(self):
+        if not self.running or not self.distraction_apps_listbox.winfo_exists(): return
+        totals = self.activity_correlator.get_live_distraction_by_app(
+            self.multi_camera_monitor.primary_monitor.get_current_state_interval(), time.time())
+        self.distraction_apps_listbox.delete(0, tk.END)
+        for item in self.activity_correlator.get_formatted_distraction_for_display(totals):
+            self.distraction_apps_listbox.insert(tk.END, item)
+
     def _update_block_management_ui(self):
         if not self.running: return
 
@@ -332,8 +513,10 @@ class MainDashboard(tk.Tk):
     def _on_closing(self):
         self.running = False
         time.sleep(0.1) 
-        if hasattr(self, 'head_pose_monitor') and self.head_pose_monitor:
-            self.head_pose_monitor.release_resources()
+        self.distraction_detector.flush_config()
+        self.cpu_governor.flush_config()
+        if hasattr(self, 'multi_camera_monitor') and self.multi_camera_monitor:
+            self.multi_camera_monitor.release_resources()
         self.destroy()
 
 if __name__ == "__main__":
@@ -0,0 +1,216 @@
+import copy
+import json
+import os
+import stat
+import tempfile
+import threading
+import time
+
+DEFAULT_DEBOUNCE_SECONDS = 0.5
+DEFAULT_MAX_DELAY_SECONDS = 2.0
+
+# mkstemp creates files as 0600; new config files get the usual mode for the process umask instead.
+# Read once at import: os.umask() can only be read by setting it, which is not thread-safe later on.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+NEW_FILE_MODE = 0o666 & ~_UMASK
+
+
+class ConfigService:
+    """
+    In-memory config value backed by a JSON file.
+
+    Changes apply in memory immediately. Writes are debounced and done by one long-lived writer
+    thread using write-to-temp-then-rename, so a burst of slider ticks becomes one atomic file
+    write. The lock is only held to copy the value, never during disk I/O, so set()/update()
+    from the UI thread never wait for a write. External edits are picked up by comparing the
+    file's mtime in check_for_external_changes().
+    """
+
+    def __init__(self, path, default, validate=None, name="Config",
+                 debounce_seconds=DEFAULT_DEBOUNCE_SECONDS, max_delay_seconds=DEFAULT_MAX_DELAY_SECONDS):
+        self.path = path
+        self.default = copy.deepcopy(default)
+        self.validate = validate if validate is not None else (lambda value: value)
+        self.name = name
+        self.debounce_seconds = debounce_seconds
+        self.max_delay_seconds = max_delay_seconds
+
+        self._lock = threading.RLock()
+        self._changed = threading.Condition(self._lock) # Wakes the writer thread
+        self._write_lock = threading.Lock() # Serialises writes from the writer thread and flush() callers
+        self._value = copy.deepcopy(default)
+        self._mtime_ns = None
+        # Every change bumps _generation; the value is saved when _saved_generation has caught up
+        self._generation = 0
+        self._saved_generation = 0
+        self._writing = False
+        self._first_pending_time = None
+        self._last_change_time = None
+        self._writer_thread = None
+        self._listeners = []
+
+        self.load()
+
+    def load(self):
+        """Reads the file, falling back to (and persisting) the default if it is missing or invalid."""
+        needs_write = False
+        with self._lock:
+            if not os.path.exists(self.path):
+                print(f"{self.name} file not found. Using defaults and creating one.")
+                self._value = copy.deepcopy(self.default)
+                needs_write = True
+            else:
+                try:
+                    mtime_ns = os.stat(self.path).st_mtime_ns
+                    with open(self.path, 'r') as f:
+                        self._value = self.validate(json.load(f))
+                    self._mtime_ns = mtime_ns
+                    print(f"{self.name} loaded from {self.path}")
+                except (json.JSONDecodeError, TypeError, ValueError) as e:
+                    print(f"{self.name} error loading {self.path}: {e}. Using defaults and overwriting.")
+                    self._value = copy.deepcopy(self.default)
+                    needs_write = True
+                except OSError as e:
+                    print(f"{self.name} error reading {self.path}: {e}. Using defaults.")
+                    self._value = copy.deepcopy(self.default)
+        if needs_write:
+            self.flush(force=True)
+
+    def get(self):
+        """Returns a copy of the current value."""
+        with self._lock:
+            return copy.deepcopy(self._value)
+
+    def set(self, value):
+        """Replaces the value in memory and schedules a debounced save. No-op if nothing changed."""
+        with self._lock:
+            if value == self._value:
+                return
+            self._value = copy.deepcopy(value)
+            self._schedule_save()
+
+    def update(self, **changes):
+        """Updates keys of a dict value in memory and schedules a debounced save."""
+        with self._lock:
+            new_value = dict(self._value)
+            new_value.update(changes)
+            self.set(new_value)
+
+    def add_listener(self, callback):
+        """Registers callback(value), called after an external edit has been reloaded."""
+        self._listeners.append(callback)
+
+    def _is_dirty(self):
+        return self._generation != self._saved_generation
+
+    def _schedule_save(self):
+        # Called with the lock held
+        now = time.time()
+        self._generation += 1
+        self._last_change_time = now
+        if self._first_pending_time is None:
+            self._first_pending_time = now
+        if self._writer_thread is None:
+            self._writer_thread = threading.Thread(target=self._run_writer, name=f"{self.name} writer", daemon=True)
+            self._writer_thread.start()
+        self._changed.notify()
+
+    def _run_writer(self):
+        while True:
+            with self._changed:
+                while True:
+                    if self._is_dirty() and self._first_pending_time is not None:
+                        # Restart the debounce window on every change, but never hold a change back longer than max_delay_seconds
+                        deadline = min(self._last_change_time + self.debounce_seconds,
+                                       self._first_pending_time + self.max_delay_seconds)
+                        remaining = deadline - time.time()
+                        if remaining <= 0:
+                            break
+                        self._changed.wait(remaining)
+                    else:
+                        self._changed.wait()
+            self.flush()
+
+    def flush(self, force=False):
+        """Writes pending changes now. Called by the writer thread and on shutdown."""
+        with self._write_lock:
+            with self._lock:
+                self._first_pending_time = None
+                if not (self._is_dirty() or force):
+                    return
+                value = copy.deepcopy(self._value)
+                generation = self._generation
+                self._writing = True
+            try:
+                mtime_ns = self._write_atomic(value)
+            except Exception as e:
+                print(f"{self.name} error saving {self.path}: {e}")
+                with self._lock:
+                    self._writing = False
+                    if self._is_dirty():
+                        # Try again after another debounce window rather than spinning
+                        self._first_pending_time = self._last_change_time = time.time()
+                        self._changed.notify()
+                return
+            with self._lock:
+                self._writing = False
+                self._mtime_ns = mtime_ns
+                # Changes made while writing keep _generation ahead, so they stay pending for the writer thread
+                self._saved_generation = max(self._saved_generation, generation)
+                if self._is_dirty() and self._first_pending_time is None:
+                    self._first_pending_time = self._last_change_time
+                    self._changed.notify()
+
+    def _write_atomic(self, value):
+        """Writes value to a temp file and renames it over path, keeping path's permissions. Returns the new mtime."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        try:
+            mode = stat.S_IMODE(os.stat(self.path).st_mode)
+        except FileNotFoundError:
+            mode = NEW_FILE_MODE
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_", suffix=".json")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(value, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_path, mode)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return os.stat(self.path).st_mtime_ns
+
+    def check_for_external_changes(self):
+        """
+        Reloads the file if its mtime changed since we last read or wrote it.
+        Returns True if a new value was loaded (listeners have been notified).
+        """
+        try:
+            mtime_ns = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return False
+        with self._lock:
+            # Pending in-memory changes win; they will overwrite the file shortly anyway.
+            # While our own write is in flight the mtime changes before _mtime_ns is updated.
+            if mtime_ns == self._mtime_ns or self._is_dirty() or self._writing:
+                return False
+            try:
+                with open(self.path, 'r') as f:
+                    new_value = self.validate(json.load(f))
+            except (OSError, json.JSONDecodeError, TypeError, ValueError) as e:
+                # Keep the current value; a later (fixed) edit changes the mtime again
+                print(f"{self.name} ignoring unreadable external edit: {e}")
+                self._mtime_ns = mtime_ns
+                return False
+            self._mtime_ns = mtime_ns
+            if new_value == self._value:
+                return False
+            self._value = new_value
+            print(f"{self.name} reloaded after external edit.")
+        for callback in list(self._listeners):
+            callback(self.get())
+        return True
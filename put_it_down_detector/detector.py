@@ -1,11 +1,9 @@
-import cv2
-import mediapipe as mp
-import numpy as np
 import math
-import json
 import time
 import os
 import collections
+import threading
+from put_it_down_detector.config_service import ConfigService
 # sys import for path modification is no longer needed here if DistractionDetector is not imported
 # from DistractionDetector import DistractionDetector # This import is also removed
 
@@ -16,14 +14,178 @@ CONFIG_FILE = os.path.join(SCRIPT_DIR, "config.json")
 DEFAULT_PITCH_THRESHOLD = 90.0
 DEFAULT_TIME_THRESHOLD_SECONDS = 5.0
 DEFAULT_PITCH_SMOOTHING_WINDOW_SECONDS = 0.5
+DEFAULT_WEBCAM_IDS = [0]  # Cameras tracked by MultiCameraMonitor
+DEFAULT_MAX_NUM_FACES = 1 # Faces (subjects) tracked per camera
+MAX_FACE_MATCH_DISTANCE = 0.2     # Max normalised nose-tip movement between frames for a face to keep its subject
+FRAMES_UNTIL_POSITION_RESET = 30  # A subject unseen for this many frames forgets its position and can take any face
+MAX_PENDING_STATE_INTERVALS = 1000 # Finished intervals kept per subject until drained; older ones are dropped
+
+# Face mesh overlay levels, cheapest last (set by CpuGovernor via set_processing_options)
+OVERLAY_FULL = "full"         # Full tesselation
+OVERLAY_CONTOURS = "contours" # Face outline, eyes, brows and lips only
+OVERLAY_NONE = "none"
+
+# cv2 and mediapipe take seconds to import, so they are loaded by _import_heavy_modules()
+# from HeadPoseMonitor.warm_up() on a background thread instead of at module import.
+cv2 = None
+mp = None
 
 # Landmark Indices
 NOSE_TIP_INDEX = 1
 CHIN_INDEX = 152
 FOREHEAD_INDEX = 10
 
+def _import_heavy_modules():
+    global cv2, mp
+    if cv2 is None:
+        import cv2 as cv2_module
+        cv2 = cv2_module
+    if mp is None:
+        import mediapipe as mp_module
+        mp = mp_module
+
+def _validate_config(config):
+    if not isinstance(config, dict):
+        raise TypeError("config is not a JSON object")
+    webcam_ids = config.get("webcam_ids", DEFAULT_WEBCAM_IDS)
+    if not isinstance(webcam_ids, list) or not webcam_ids:
+        raise TypeError("webcam_ids is not a non-empty list")
+    return {
+        "pitch_threshold": float(config.get("pitch_threshold", DEFAULT_PITCH_THRESHOLD)),
+        "time_threshold_seconds": float(config.get("time_threshold_seconds", DEFAULT_TIME_THRESHOLD_SECONDS)),
+        "pitch_smoothing_window_seconds": float(config.get("pitch_smoothing_window_seconds", DEFAULT_PITCH_SMOOTHING_WINDOW_SECONDS)),
+        "webcam_ids": [int(webcam_id) for webcam_id in webcam_ids],
+        "max_num_faces": max(1, int(config.get("max_num_faces", DEFAULT_MAX_NUM_FACES)))
+    }
+
+def create_config_service(path=CONFIG_FILE):
+    """Creates the ConfigService for config.json (or path). Pass it to every HeadPoseMonitor so cameras share one file."""
+    return ConfigService(
+        path,
+        default={
+            "pitch_threshold": DEFAULT_PITCH_THRESHOLD,
+            "time_threshold_seconds": DEFAULT_TIME_THRESHOLD_SECONDS,
+            "pitch_smoothing_window_seconds": DEFAULT_PITCH_SMOOTHING_WINDOW_SECONDS,
+            "webcam_ids": list(DEFAULT_WEBCAM_IDS),
+            "max_num_faces": DEFAULT_MAX_NUM_FACES
+        },
+        validate=_validate_config,
+        name="HPM Config"
+    )
+
+class SubjectState:
+    """Pitch history, state machine and time totals for one tracked face."""
+
+    def __init__(self, subject_id):
+        self.subject_id = subject_id
+        self.status = "Warming up..."
+        self.looking_down_start_time = None
+        self.limbo_timer_display = 0.0
+        self.pitch_history = collections.deque()
+        self.raw_pitch_metric_val = 0.0
+        self.smoothed_pitch_metric_val = 0.0
+        self.last_position = None # Normalised (x, y) of the nose tip, used to keep faces matched to subjects
+        self.frames_unseen = 0
+
+        self.total_time_overall = 0.0
+        self.total_time_on_phone = 0.0
+        self.total_time_on_screen = 0.0
+        self.total_time_limbo = 0.0
+        self.total_time_no_face = 0.0
+        self.last_frame_time = time.time()
+        self.start_time_overall = time.time()
+        self.previous_status = "Warming up..."
+        self.state_start_time = self.start_time_overall
+        # Finished state intervals as (status, start_time, end_time), drained by consumers such as ActivityCorrelator.
+        # Bounded so subjects nobody drains (e.g. secondary faces) do not grow without limit.
+        self.completed_state_intervals = collections.deque(maxlen=MAX_PENDING_STATE_INTERVALS)
+
+    def reset_clock(self, now):
+        """Starts timing from now, so time spent before (e.g. warming up) is not attributed to any state."""
+        self.last_frame_time = now
+        self.start_time_overall = now
+        self.state_start_time = now
+
+    def update(self, raw_pitch_metric, current_loop_time, pitch_threshold, time_threshold_seconds, pitch_smoothing_window_seconds):
+        """Advances the state machine by one frame. raw_pitch_metric is None when this subject's face was not found."""
+        delta_time = current_loop_time - self.last_frame_time
+        self.last_frame_time = current_loop_time
+        self.total_time_overall = current_loop_time - self.start_time_overall
+
+        if raw_pitch_metric is not None:
+            self.raw_pitch_metric_val = raw_pitch_metric
+            self.pitch_history.append((current_loop_time, self.raw_pitch_metric_val))
+            
+            while self.pitch_history and self.pitch_history[0][0] < (current_loop_time - pitch_smoothing_window_seconds):
+                self.pitch_history.popleft()
+            
+            if self.pitch_history:
+                self.smoothed_pitch_metric_val = sum(p[1] for p in self.pitch_history) / len(self.pitch_history)
+            else:
+                self.smoothed_pitch_metric_val = self.raw_pitch_metric_val
+
+            is_looking_down = self.smoothed_pitch_metric_val > pitch_threshold
+            if is_looking_down:
+                if self.looking_down_start_time is None:
+                    self.looking_down_start_time = current_loop_time
+                duration_looking_down = current_loop_time - self.looking_down_start_time
+                self.limbo_timer_display = duration_looking_down
+                if duration_looking_down >= time_threshold_seconds:
+                    self.status = "Looking at Phone"
+                else:
+                    self.status = "Limbo"
+            else:
+                self.looking_down_start_time = None
+                self.limbo_timer_display = 0.0
+                # Basic check for looking up, could be refined
+                if self.smoothed_pitch_metric_val < -pitch_threshold : # Example: if pitch is significantly negative
+                    self.status = "Looking Up"
+                else:
+                    self.status = "Looking at Screen"
+        else:
+            self.status = "No Face Detected"
+            self.looking_down_start_time = None
+            self.limbo_timer_display = 0.0
+            self.pitch_history.clear()
+            self.raw_pitch_metric_val = 0.0
+            self.smoothed_pitch_metric_val = 0.0
+        
+        if self.previous_status == "Looking at Phone": self.total_time_on_phone += delta_time
+        elif self.previous_status == "Looking at Screen" or self.previous_status == "Looking Up": self.total_time_on_screen += delta_time
+        elif self.previous_status == "Limbo": self.total_time_limbo += delta_time
+        elif self.previous_status == "No Face Detected": self.total_time_no_face += delta_time
+        if self.status != self.previous_status:
+            self.completed_state_intervals.append((self.previous_status, self.state_start_time, current_loop_time))
+            self.state_start_time = current_loop_time
+        self.previous_status = self.status
+
+    def get_status_info(self):
+        return {
+            "subject_id": self.subject_id,
+            "status": self.status,
+            "raw_pitch": self.raw_pitch_metric_val,
+            "smooth_pitch": self.smoothed_pitch_metric_val,
+            "limbo_timer": self.limbo_timer_display,
+            "total_time_overall": self.total_time_overall,
+            "total_time_on_phone": self.total_time_on_phone,
+            "total_time_on_screen": self.total_time_on_screen,
+            "total_time_limbo": self.total_time_limbo,
+            "total_time_no_face": self.total_time_no_face
+        }
+
+    def pop_completed_state_intervals(self):
+        """Returns and clears the list of (status, start_time, end_time) intervals finished since the last call."""
+        intervals = []
+        while self.completed_state_intervals:
+            intervals.append(self.completed_state_intervals.popleft())
+        return intervals
+
+    def get_current_state_interval(self):
+        """Returns (status, start_time) for the state interval that is still in progress."""
+        return self.previous_status, self.state_start_time
+
 class HeadPoseMonitor:
-    def __init__(self, webcam_id=0):
+    def __init__(self, webcam_id=0, max_num_faces=None, config_service=None):
         self.webcam_id = webcam_id
         self.cap = None
         self.face_mesh = None
@@ -35,90 +197,119 @@ class HeadPoseMonitor:
         self.time_threshold_seconds = DEFAULT_TIME_THRESHOLD_SECONDS
         self.pitch_smoothing_window_seconds = DEFAULT_PITCH_SMOOTHING_WINDOW_SECONDS
         
-        self._load_config()
+        self._load_config(config_service)
+        self.max_num_faces = max_num_faces if max_num_faces is not None else self.config_service.get()["max_num_faces"]
+
+        # Processing options, lowered by CpuGovernor when over its CPU budget
+        self.processing_scale = 1.0 # Frames are downscaled by this factor before FaceMesh
+        self.overlay_level = OVERLAY_FULL
 
         self.image_height = 480  # Default, will be updated
         self.image_width = 640   # Default, will be updated
 
-        # State variables for processing
-        self.status = "Initializing..."
-        self.looking_down_start_time = None
-        self.limbo_timer_display = 0.0
-        self.pitch_history = collections.deque()
-        self.raw_pitch_metric_val = 0.0
-        self.smoothed_pitch_metric_val = 0.0
-        
-        self.total_time_overall = 0.0
-        self.total_time_on_phone = 0.0
-        self.total_time_on_screen = 0.0
-        self.total_time_limbo = 0.0
-        self.total_time_no_face = 0.0
-        self.last_frame_time = time.time()
-        self.start_time_overall = time.time()
-        self.previous_status = "Initializing..."
+        # One SubjectState per face; subjects[0] is the primary subject shown by the single-camera dashboard
+        self.subjects = [SubjectState(f"cam{self.webcam_id}/face{i}") for i in range(self.max_num_faces)]
+
+        # Model and camera are loaded by warm_up(), which callers run off the UI thread
+        self.is_warmed_up = False
+        self.startup_timings = {} # step name: seconds; written by warm_up() and camera retries, read via get_startup_timings()
+        self._startup_timings_lock = threading.Lock()
 
+    def warm_up(self):
+        """
+        Imports cv2/mediapipe, builds FaceMesh and opens the camera, recording how long each step took
+        in self.startup_timings. Blocking; run it on a background thread.
+        """
+        step_start = time.perf_counter()
+        _import_heavy_modules()
+        self._record_startup_timing("imports", step_start)
         self._initialize_resources()
 
+        # Time spent warming up is not attributed to any state
+        now = time.time()
+        for subject in self.subjects:
+            subject.reset_clock(now)
+        self.is_warmed_up = True
+        print("HPM startup: " + ", ".join(f"{name}={seconds:.2f}s" for name, seconds in self.get_startup_timings().items()))
+
+    def _record_startup_timing(self, name, step_start):
+        with self._startup_timings_lock:
+            self.startup_timings[name] = time.perf_counter() - step_start
+
+    def get_startup_timings(self):
+        """Returns a copy of startup_timings that is safe to iterate while the camera is (re)opening."""
+        with self._startup_timings_lock:
+            return dict(self.startup_timings)
+
     def _initialize_resources(self):
+        self._load_model()
+        self._open_camera()
+
+    def _load_model(self):
+        _import_heavy_modules()
+        step_start = time.perf_counter()
+        if self.face_mesh is not None:
+            self.face_mesh.close()
         self.mp_face_mesh = mp.solutions.face_mesh
         self.face_mesh = self.mp_face_mesh.FaceMesh(
-            max_num_faces=1,
+            max_num_faces=self.max_num_faces,
             refine_landmarks=True,
             min_detection_confidence=0.5,
             min_tracking_confidence=0.5
         )
         self.mp_drawing = mp.solutions.drawing_utils
         self.drawing_spec = self.mp_drawing.DrawingSpec(thickness=1, circle_radius=1)
+        self._record_startup_timing("model_load", step_start)
 
+    def _open_camera(self, record_timings=True):
+        self.close_camera()
+        step_start = time.perf_counter()
         self.cap = cv2.VideoCapture(self.webcam_id)
+        if record_timings: self._record_startup_timing("camera_open", step_start)
         if not self.cap.isOpened():
-            print("Error: Could not open webcam.")
+            print(f"Error: Could not open webcam {self.webcam_id}.")
             # TODO: Handle this error more gracefully for the GUI
             return
 
+        step_start = time.perf_counter()
         success_init, init_frame = self.cap.read()
+        if record_timings: self._record_startup_timing("first_frame", step_start)
         if not success_init:
-            print("Error: Could not read initial frame from webcam.")
-            self.release_resources()
+            print(f"Error: Could not read initial frame from webcam {self.webcam_id}.")
+            self.close_camera()
             return
         
         init_frame_flipped = cv2.flip(init_frame, 1)
         self.image_height, self.image_width, _ = init_frame_flipped.shape
-        print(f"Webcam initialized: {self.image_width}x{self.image_height}")
-
-
-    def _load_config(self):
-        if os.path.exists(CONFIG_FILE):
-            try:
-                with open(CONFIG_FILE, 'r') as f:
-                    config = json.load(f)
-                    self.pitch_threshold = float(config.get("pitch_threshold", DEFAULT_PITCH_THRESHOLD))
-                    self.time_threshold_seconds = float(config.get("time_threshold_seconds", DEFAULT_TIME_THRESHOLD_SECONDS))
-                    self.pitch_smoothing_window_seconds = float(config.get("pitch_smoothing_window_seconds", DEFAULT_PITCH_SMOOTHING_WINDOW_SECONDS))
-                    print(f"HPM Loaded config: PitchThr={self.pitch_threshold}, TimeThr={self.time_threshold_seconds}s, SmoothWin={self.pitch_smoothing_window_seconds}s")
-            except (json.JSONDecodeError, TypeError) as e:
-                print(f"HPM Error loading config: {e}. Using defaults.")
-                self._set_defaults_and_save()
-        else:
-            print("HPM Config file not found. Using defaults and creating one.")
-            self._set_defaults_and_save()
+        print(f"Webcam {self.webcam_id} initialized: {self.image_width}x{self.image_height}")
 
-    def _set_defaults_and_save(self):
-        self.pitch_threshold = DEFAULT_PITCH_THRESHOLD
-        self.time_threshold_seconds = DEFAULT_TIME_THRESHOLD_SECONDS
-        self.pitch_smoothing_window_seconds = DEFAULT_PITCH_SMOOTHING_WINDOW_SECONDS
-        self.save_config()
+
+    def _load_config(self, config_service=None):
+        self.config_service = config_service if config_service is not None else create_config_service()
+        self.config_service.add_listener(self._apply_config)
+        self._apply_config(self.config_service.get())
+
+    def _apply_config(self, config):
+        self.pitch_threshold = config["pitch_threshold"]
+        self.time_threshold_seconds = config["time_threshold_seconds"]
+        self.pitch_smoothing_window_seconds = config["pitch_smoothing_window_seconds"]
+        print(f"HPM Applied config: PitchThr={self.pitch_threshold}, TimeThr={self.time_threshold_seconds}s, SmoothWin={self.pitch_smoothing_window_seconds}s")
+
+    def set_processing_options(self, processing_scale=None, overlay_level=None):
+        """Adjusts per-frame cost. Pitch uses normalised landmarks, so it does not depend on resolution."""
+        if processing_scale is not None:
+            self.processing_scale = min(1.0, max(0.1, float(processing_scale)))
+        if overlay_level is not None:
+            self.overlay_level = overlay_level
 
     def save_config(self):
-        config = {
-            "pitch_threshold": self.pitch_threshold,
-            "time_threshold_seconds": self.time_threshold_seconds,
-            "pitch_smoothing_window_seconds": self.pitch_smoothing_window_seconds
-        }
-        os.makedirs(os.path.dirname(CONFIG_FILE), exist_ok=True)
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump(config, f, indent=4)
-        print(f"HPM Saved config: PitchThr={self.pitch_threshold}, TimeThr={self.time_threshold_seconds}s, SmoothWin={self.pitch_smoothing_window_seconds}s")
+        """Writes the current thresholds to disk immediately (slider changes are saved debounced)."""
+        self.config_service.update(**self.get_current_thresholds())
+        self.config_service.flush()
+
+    def check_config_for_external_changes(self):
+        """Reloads config.json if it was edited outside the app. Returns True if new values were applied."""
+        return self.config_service.check_for_external_changes()
 
     def _calculate_pitch_metric(self, face_landmarks, image_shape):
         # h, w, _ = image_shape # Not strictly needed if using normalized z
@@ -129,106 +320,156 @@ class HeadPoseMonitor:
         raw_pitch_metric = (z_chin - z_forehead) * 1000 
         return raw_pitch_metric
 
-    def process_next_frame(self):
-        if not self.cap or not self.cap.isOpened():
-            return None, {} # Return None frame and empty status if no camera
+    def is_camera_open(self):
+        return bool(self.cap and self.cap.isOpened())
+
+    def reopen_camera(self):
+        """
+        Reopens a camera that failed to open or was disconnected. The FaceMesh model is kept (it is only
+        loaded if warm_up() never got that far) and the startup timings are left as they were.
+        """
+        if self.face_mesh is None:
+            self._load_model()
+        self._open_camera(record_timings=False)
+
+    def close_camera(self):
+        if self.cap is not None and self.cap.isOpened():
+            self.cap.release()
+
+    def _assign_faces_to_subjects(self, multi_face_landmarks):
+        """
+        Returns {subject index: face_landmarks}. FaceMesh does not keep faces in a stable order, so
+        subject/face pairs are matched closest first by nose-tip distance across all subjects, ignoring
+        pairs further apart than MAX_FACE_MATCH_DISTANCE. Faces left over go to subjects with no known position.
+        """
+        faces = list(multi_face_landmarks or [])
+        candidate_pairs = []
+        for i, subject in enumerate(self.subjects):
+            if subject.last_position is None:
+                continue
+            last_x, last_y = subject.last_position
+            for j, face in enumerate(faces):
+                nose_tip = face.landmark[NOSE_TIP_INDEX]
+                distance = math.hypot(nose_tip.x - last_x, nose_tip.y - last_y)
+                if distance <= MAX_FACE_MATCH_DISTANCE:
+                    candidate_pairs.append((distance, i, j))
+        candidate_pairs.sort()
 
+        assignments = {}
+        matched_faces = set()
+        for _, i, j in candidate_pairs:
+            if i not in assignments and j not in matched_faces:
+                assignments[i] = faces[j]
+                matched_faces.add(j)
+        remaining = [face for j, face in enumerate(faces) if j not in matched_faces]
+        for i, subject in enumerate(self.subjects):
+            if i not in assignments and subject.last_position is None and remaining:
+                assignments[i] = remaining.pop(0)
+        return assignments
+
+    def process_next_frame(self):
+        """Reads and processes one frame. Returns (annotated_frame, status_info), or (None, {}) if no frame was read."""
         current_loop_time = time.time()
-        delta_time = current_loop_time - self.last_frame_time
-        self.last_frame_time = current_loop_time
-        self.total_time_overall = current_loop_time - self.start_time_overall
+        frame = self.read_frame()
+        if frame is None:
+            return None, {} # Or previous frame/status?
+        return self.process_frame(frame, current_loop_time)
 
+    def read_frame(self):
+        """Blocks for the next camera frame. Returns None if the camera is closed or the read failed."""
+        if not self.is_camera_open():
+            return None
         success, frame = self.cap.read()
         if not success:
-            print("HPM: Ignoring empty camera frame.")
-            return None, {} # Or previous frame/status?
+            print(f"HPM: Ignoring empty camera frame from webcam {self.webcam_id}.")
+            return None
+        return frame
 
-        image_processed = cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB)
-        image_processed.flags.writeable = False
+    def process_frame(self, frame, current_loop_time):
+        """
+        Runs FaceMesh on a BGR camera frame captured at current_loop_time and advances every subject.
+        Returns (annotated_frame, status_info). Not thread-safe: one frame per monitor at a time.
+        """
+        # Inference runs on the downscaled copy; landmarks are normalised, so the overlay is drawn at full size
+        annotated_frame, image_processed = self._prepare_frame(frame)
         results = self.face_mesh.process(image_processed)
-        
-        annotated_frame = cv2.cvtColor(image_processed, cv2.COLOR_RGB2BGR)
-        annotated_frame.flags.writeable = True
-
-        if results.multi_face_landmarks:
-            for face_landmarks in results.multi_face_landmarks:
-                self.mp_drawing.draw_landmarks(
-                    image=annotated_frame,
-                    landmark_list=face_landmarks,
-                    connections=self.mp_face_mesh.FACEMESH_TESSELATION,
-                    landmark_drawing_spec=self.drawing_spec,
-                    connection_drawing_spec=self.drawing_spec)
-
-                self.raw_pitch_metric_val = self._calculate_pitch_metric(face_landmarks, annotated_frame.shape)
-                self.pitch_history.append((current_loop_time, self.raw_pitch_metric_val))
-                
-                while self.pitch_history and self.pitch_history[0][0] < (current_loop_time - self.pitch_smoothing_window_seconds):
-                    self.pitch_history.popleft()
-                
-                if self.pitch_history:
-                    self.smoothed_pitch_metric_val = sum(p[1] for p in self.pitch_history) / len(self.pitch_history)
-                else:
-                    self.smoothed_pitch_metric_val = self.raw_pitch_metric_val
-
-                is_looking_down = self.smoothed_pitch_metric_val > self.pitch_threshold
-                if is_looking_down:
-                    if self.looking_down_start_time is None:
-                        self.looking_down_start_time = current_loop_time
-                    duration_looking_down = current_loop_time - self.looking_down_start_time
-                    self.limbo_timer_display = duration_looking_down
-                    if duration_looking_down >= self.time_threshold_seconds:
-                        self.status = "Looking at Phone"
-                    else:
-                        self.status = "Limbo"
-                else:
-                    self.looking_down_start_time = None
-                    self.limbo_timer_display = 0.0
-                    # Basic check for looking up, could be refined
-                    if self.smoothed_pitch_metric_val < -self.pitch_threshold : # Example: if pitch is significantly negative
-                        self.status = "Looking Up"
-                    else:
-                        self.status = "Looking at Screen"
-        else:
-            self.status = "No Face Detected"
-            self.looking_down_start_time = None
-            self.limbo_timer_display = 0.0
-            self.pitch_history.clear()
-            self.raw_pitch_metric_val = 0.0
-            self.smoothed_pitch_metric_val = 0.0
-        
-        if self.previous_status == "Looking at Phone": self.total_time_on_phone += delta_time
-        elif self.previous_status == "Looking at Screen" or self.previous_status == "Looking Up": self.total_time_on_screen += delta_time
-        elif self.previous_status == "Limbo": self.total_time_limbo += delta_time
-        elif self.previous_status == "No Face Detected": self.total_time_no_face += delta_time
-        self.previous_status = self.status
+        self._draw_overlay(annotated_frame, results.multi_face_landmarks)
+        self.update_subjects(results.multi_face_landmarks, current_loop_time)
 
-        status_info = {
-            "status": self.status,
-            "raw_pitch": self.raw_pitch_metric_val,
-            "smooth_pitch": self.smoothed_pitch_metric_val,
-            "limbo_timer": self.limbo_timer_display,
+        # Top-level keys describe the primary subject; "subjects" has one entry per tracked face
+        status_info = self.subjects[0].get_status_info()
+        status_info.update({
+            "webcam_id": self.webcam_id,
             "time_threshold": self.time_threshold_seconds,
-            "total_time_overall": self.total_time_overall,
-            "total_time_on_phone": self.total_time_on_phone,
-            "total_time_on_screen": self.total_time_on_screen,
-            "total_time_limbo": self.total_time_limbo,
-            "total_time_no_face": self.total_time_no_face,
             "image_width": self.image_width, # For GUI to create sidebar if needed
-            "image_height": self.image_height
-        }
+            "image_height": self.image_height,
+            "subjects": [subject.get_status_info() for subject in self.subjects]
+        })
         return annotated_frame, status_info
 
+    def _prepare_frame(self, frame):
+        """
+        Mirrors a BGR camera frame and returns (mirrored_bgr, image_processed): the full-size mirrored frame
+        for display, and a read-only RGB copy downscaled by processing_scale for FaceMesh.
+        """
+        mirrored = cv2.flip(frame, 1)
+        small = mirrored
+        if self.processing_scale < 1.0:
+            small = cv2.resize(mirrored, None, fx=self.processing_scale, fy=self.processing_scale, interpolation=cv2.INTER_AREA)
+        image_processed = cv2.cvtColor(small, cv2.COLOR_BGR2RGB) # Always a new array, so mirrored stays drawable
+        image_processed.flags.writeable = False
+        return mirrored, image_processed
+
+    def _draw_overlay(self, annotated_frame, multi_face_landmarks):
+        if not multi_face_landmarks or self.overlay_level == OVERLAY_NONE:
+            return
+        for face_landmarks in multi_face_landmarks:
+            self.mp_drawing.draw_landmarks(
+                image=annotated_frame,
+                landmark_list=face_landmarks,
+                connections=(self.mp_face_mesh.FACEMESH_TESSELATION if self.overlay_level == OVERLAY_FULL
+                             else self.mp_face_mesh.FACEMESH_CONTOURS),
+                landmark_drawing_spec=self.drawing_spec,
+                connection_drawing_spec=self.drawing_spec)
+
+    def update_subjects(self, multi_face_landmarks, current_loop_time):
+        """Advances every subject's smoothing and state machine with one frame of FaceMesh landmarks (None if no faces)."""
+        assignments = self._assign_faces_to_subjects(multi_face_landmarks)
+        for i, subject in enumerate(self.subjects):
+            face_landmarks = assignments.get(i)
+            raw_pitch_metric = None
+            if face_landmarks is not None:
+                raw_pitch_metric = self._calculate_pitch_metric(face_landmarks, None)
+                nose_tip = face_landmarks.landmark[NOSE_TIP_INDEX]
+                subject.last_position = (nose_tip.x, nose_tip.y)
+                subject.frames_unseen = 0
+            else:
+                subject.frames_unseen += 1
+                if subject.frames_unseen >= FRAMES_UNTIL_POSITION_RESET:
+                    subject.last_position = None
+            subject.update(raw_pitch_metric, current_loop_time, self.pitch_threshold,
+                           self.time_threshold_seconds, self.pitch_smoothing_window_seconds)
+
+    def pop_completed_state_intervals(self):
+        """Returns and clears the primary subject's (status, start_time, end_time) intervals finished since the last call."""
+        return self.subjects[0].pop_completed_state_intervals()
+
+    def get_current_state_interval(self):
+        """Returns (status, start_time) for the primary subject's state interval that is still in progress."""
+        return self.subjects[0].get_current_state_interval()
+
+    # Slider callbacks: apply in memory now, the config service persists them debounced off the UI thread
     def update_pitch_threshold(self, val):
         self.pitch_threshold = float(val)
-        self.save_config()
+        self.config_service.update(pitch_threshold=self.pitch_threshold)
 
     def update_time_threshold(self, val):
         self.time_threshold_seconds = float(val)
-        self.save_config()
+        self.config_service.update(time_threshold_seconds=self.time_threshold_seconds)
 
     def update_smoothing_window(self, val_0_1s): # val is in 0.1s units
         self.pitch_smoothing_window_seconds = float(val_0_1s) / 10.0
-        self.save_config()
+        self.config_service.update(pitch_smoothing_window_seconds=self.pitch_smoothing_window_seconds)
         
     def get_current_thresholds(self):
         return {
@@ -239,10 +480,11 @@ class HeadPoseMonitor:
 
     def release_resources(self):
         print("HPM: Releasing resources...")
-        if self.cap and self.cap.isOpened():
-            self.cap.release()
+        self.config_service.flush()
+        self.close_camera()
         if self.face_mesh:
             self.face_mesh.close()
+            self.face_mesh = None
         # cv2.destroyAllWindows() # GUI will manage its own window
         print("HPM: Done releasing resources.")
 
@@ -253,6 +495,7 @@ class HeadPoseMonitor:
 # For example:
 # if __name__ == '__main__':
 #     monitor = HeadPoseMonitor()
+#     monitor.warm_up()
 #     if monitor.cap and monitor.cap.isOpened():
 #         while True:
 #             frame, status_info = monitor.process_next_frame()
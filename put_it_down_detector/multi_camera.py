@@ -0,0 +1,217 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from put_it_down_detector.detector import HeadPoseMonitor, create_config_service
+
+DEFAULT_FRAME_RATE = 30.0
+CAMERA_RETRY_INITIAL_SECONDS = 5.0 # First retry of a closed camera; the delay doubles after each failed retry...
+CAMERA_RETRY_MAX_SECONDS = 60.0    # ...up to this
+READ_FAILURES_BEFORE_REOPEN = 10   # Consecutive failed reads after which a camera is treated as disconnected
+CAPTURE_JOIN_TIMEOUT_SECONDS = 1.0
+
+
+class MultiCameraMonitor:
+    """
+    Runs several HeadPoseMonitors (one per camera, each tracking up to max_num_faces subjects),
+    with capture separated from inference.
+
+    Each camera has a capture thread that only blocks in cap.read() at the frame rate, and reopens
+    the camera on its own backoff when it is closed. Captured frames go to one inference pool sized
+    from os.cpu_count(), so FaceMesh work from all cameras runs on at most one thread per core and a
+    slow read only delays its own camera. A camera has at most one frame in inference at a time;
+    a frame captured meanwhile waits, replacing any older waiting frame.
+
+    Each camera keeps its own FaceMesh instance because FaceMesh tracks faces between frames, which
+    also means all faces seen by one camera are found by a single FaceMesh call on one worker:
+    extra faces add to that camera's frame time and are not spread across cores. Throughput scales
+    with cores across cameras only.
+    """
+
+    def __init__(self, webcam_ids=None, max_num_faces=None, max_workers=None):
+        self.config_service = create_config_service()
+        config = self.config_service.get()
+        self.webcam_ids = webcam_ids if webcam_ids is not None else config["webcam_ids"]
+        self.monitors = [
+            HeadPoseMonitor(webcam_id, max_num_faces=max_num_faces, config_service=self.config_service)
+            for webcam_id in self.webcam_ids
+        ]
+        self.pool = ThreadPoolExecutor(max_workers=max_workers or os.cpu_count() or 1, thread_name_prefix="hpm-inference")
+
+        self.frame_interval = 1.0 / DEFAULT_FRAME_RATE
+        # Newest result per camera, replaced by the worker that processed it
+        self.latest_results = [self._empty_result() for _ in self.monitors]
+        self.retry_delays = [CAMERA_RETRY_INITIAL_SECONDS for _ in self.monitors]
+        self.running = False
+        self._stopped = threading.Event() # Wakes capture threads waiting on pacing or backoff at shutdown
+        self._lock = threading.Lock() # Guards running and the two per-camera lists below
+        self._inference_busy = [False for _ in self.monitors]
+        self._waiting_frames = [None for _ in self.monitors] # (frame, capture_time, read_start) per camera
+        self._capture_threads = []
+
+    @staticmethod
+    def _empty_result():
+        return {"frame": None, "status_info": {}, "frame_number": 0, "loop_interval": None, "processing_time": None,
+                "read_start": None}
+
+    @property
+    def primary_monitor(self):
+        """The first camera in webcam_ids order that is open, so the dashboard keeps running if one camera is down."""
+        for monitor in self.monitors:
+            if monitor.is_camera_open():
+                return monitor
+        return self.monitors[0]
+
+    def warm_up(self):
+        """
+        Warms up every camera in parallel on the pool. Blocking; run it on a background thread.
+        Waits for every camera, then re-raises the first error (e.g. cv2/mediapipe failing to import).
+        """
+        futures = [self.pool.submit(monitor.warm_up) for monitor in self.monitors]
+        errors = [future.exception() for future in futures]
+        for error in errors:
+            if error is not None:
+                raise error
+
+    def start(self, frame_rate=DEFAULT_FRAME_RATE):
+        """Starts capturing and processing every camera; read the results with get_latest_result(). Call after warm_up()."""
+        self.set_frame_rate(frame_rate)
+        self.running = True
+        for index, monitor in enumerate(self.monitors):
+            thread = threading.Thread(target=self._run_capture, args=(index,),
+                                      name=f"hpm-capture-{monitor.webcam_id}", daemon=True)
+            thread.start()
+            self._capture_threads.append(thread)
+
+    def set_frame_rate(self, frame_rate):
+        self.frame_interval = 1.0 / frame_rate
+
+    def _run_capture(self, index):
+        monitor = self.monitors[index]
+        read_failures = 0
+        next_read_time = time.perf_counter()
+        while self.running:
+            if not monitor.is_camera_open():
+                if self._stopped.wait(self.retry_delays[index]):
+                    return
+                self._retry_camera(index)
+                read_failures = 0
+                next_read_time = time.perf_counter()
+                continue
+
+            delay = next_read_time - time.perf_counter()
+            if delay > 0 and self._stopped.wait(delay):
+                return
+            read_start = time.perf_counter()
+            next_read_time = read_start + self.frame_interval
+            capture_time = time.time()
+            frame = monitor.read_frame()
+            if frame is None:
+                read_failures += 1
+                if read_failures >= READ_FAILURES_BEFORE_REOPEN:
+                    print(f"HPM: Webcam {monitor.webcam_id} stopped delivering frames; reopening it.")
+                    monitor.close_camera()
+                continue
+            read_failures = 0
+            self._submit_frame(index, (frame, capture_time, read_start))
+
+    def _retry_camera(self, index):
+        """Tries to reopen a camera that failed to open or was disconnected, backing off while it stays closed."""
+        monitor = self.monitors[index]
+        monitor.reopen_camera()
+        if monitor.is_camera_open():
+            self.retry_delays[index] = CAMERA_RETRY_INITIAL_SECONDS
+            self.latest_results[index] = self._empty_result()
+        else:
+            self.retry_delays[index] = min(self.retry_delays[index] * 2, CAMERA_RETRY_MAX_SECONDS)
+            print(f"HPM: Webcam {monitor.webcam_id} not available. Retrying in {self.retry_delays[index]:.0f}s...")
+
+    def _submit_frame(self, index, captured):
+        with self._lock:
+            if not self.running:
+                return
+            if self._inference_busy[index]:
+                self._waiting_frames[index] = captured
+                return
+            self._inference_busy[index] = True
+            self.pool.submit(self._run_inference, index, captured)
+
+    def _run_inference(self, index, captured):
+        monitor = self.monitors[index]
+        frame, capture_time, read_start = captured
+        try:
+            annotated_frame, status_info = monitor.process_frame(frame, capture_time)
+        except Exception as e:
+            print(f"HPM: Error processing webcam {monitor.webcam_id}: {e}")
+            annotated_frame, status_info = None, {}
+        previous = self.latest_results[index]
+        self.latest_results[index] = {
+            "frame": annotated_frame,
+            "status_info": status_info,
+            "frame_number": previous["frame_number"] + 1,
+            "loop_interval": read_start - previous["read_start"] if previous["read_start"] is not None else None,
+            "processing_time": time.perf_counter() - read_start,
+            "read_start": read_start
+        }
+        # Queue the frame that arrived meanwhile behind other cameras' work rather than looping on this worker
+        with self._lock:
+            waiting = self._waiting_frames[index]
+            self._waiting_frames[index] = None
+            if waiting is None or not self.running:
+                self._inference_busy[index] = False
+                return
+            self.pool.submit(self._run_inference, index, waiting)
+
+    def get_latest_result(self, monitor):
+        """
+        Returns the newest result for monitor's camera as a dict with "frame", "status_info", "frame_number"
+        (increases with every processed frame), "loop_interval" (seconds between the reads of consecutive
+        processed frames) and "processing_time" (seconds from the start of the read to the finished result).
+        """
+        return self.latest_results[self.monitors.index(monitor)]
+
+    def get_all_subjects(self):
+        """Returns every SubjectState across all cameras."""
+        return [subject for monitor in self.monitors for subject in monitor.subjects]
+
+    def pop_completed_state_intervals(self):
+        """
+        Returns the primary subject's finished state intervals (see HeadPoseMonitor.pop_completed_state_intervals)
+        and discards every other subject's, so switching primary camera never replays a stale backlog.
+        """
+        primary_subject = self.primary_monitor.subjects[0]
+        intervals = []
+        for subject in self.get_all_subjects():
+            if subject is primary_subject:
+                intervals = subject.pop_completed_state_intervals()
+            else:
+                subject.completed_state_intervals.clear()
+        return intervals
+
+    def set_processing_options(self, processing_scale=None, overlay_level=None):
+        for monitor in self.monitors:
+            monitor.set_processing_options(processing_scale, overlay_level)
+
+    # Slider callbacks fan out to every camera; the shared config service only saves the first change
+    def update_pitch_threshold(self, val):
+        for monitor in self.monitors:
+            monitor.update_pitch_threshold(val)
+
+    def update_time_threshold(self, val):
+        for monitor in self.monitors:
+            monitor.update_time_threshold(val)
+
+    def update_smoothing_window(self, val_0_1s):
+        for monitor in self.monitors:
+            monitor.update_smoothing_window(val_0_1s)
+
+    def release_resources(self):
+        with self._lock:
+            self.running = False # Checked under the lock before every submit, so nothing reaches the pool after this
+        self._stopped.set()
+        for thread in self._capture_threads:
+            thread.join(timeout=CAPTURE_JOIN_TIMEOUT_SECONDS) # A camera stuck in cap.read() must not block shutdown
+        self.pool.shutdown(wait=True)
+        for monitor in self.monitors:
+            monitor.release_resources()